@@ -3,6 +3,7 @@
 
 from flask import Flask, jsonify
 from models import storage
+import http_compression
 from api.v1.views import app_views
 import os
 from flask_cors import CORS
@@ -14,6 +15,8 @@ app.register_blueprint(app_views)
 
 corps = CORS(app, origins="0.0.0.0")
 
+http_compression.init_app(app)
+
 
 @app.teardown_appcontext
 def appTeardown(error):
@@ -5,6 +5,8 @@ It handles all default RESTful API actions related to Amenity objects.
 """
 from flask import jsonify, abort, request
 from api.v1.views import app_views
+from api.v1.views.paging import paged
+from api.v1.views.rules import check_required, update_object
 from models import storage
 from models.amenity import Amenity
 
@@ -14,9 +16,7 @@ def get_amenitys():
     """
     get the list of all Amenity objects
     """
-    amenities = [amenity.to_dict() for amenity in storage.
-                 all(Amenity).values()]
-    return jsonify(amenities)
+    return paged(Amenity)
 
 
 @app_views.route('/amenities/<amenity_id>',
@@ -53,8 +53,7 @@ def create_amenity():
     if not request.is_json:
         abort(400, description="Not a JSON")
     amenity_data = request.get_json()
-    if 'name' not in amenity_data:
-        abort(400, description="Missing name")
+    check_required("Amenity", amenity_data)
     new_amenity = Amenity(**amenity_data)
     storage.new(new_amenity)
     storage.save()
@@ -73,9 +72,6 @@ def update_amenity(amenity_id):
     if not request.is_json:
         abort(400, description="Not a JSON")
     update_data = request.get_json()
-    ignored_keys = ['id', 'created_at', 'updated_at']
-    for key, value in update_data.items():
-        if key not in ignored_keys:
-            setattr(amenity, key, value)
+    update_object(amenity, update_data)
     storage.save()
     return jsonify(amenity.to_dict()), 200
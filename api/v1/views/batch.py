@@ -0,0 +1,42 @@
+#!/usr/bin/python3
+"""
+This module defines the view fetching many objects of the API at once.
+"""
+from flask import jsonify, abort, request
+from os import getenv
+from api.v1.views import app_views
+from models import storage
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+
+classes = {"Amenity": Amenity, "City": City, "Place": Place,
+           "Review": Review, "State": State, "User": User}
+# integer - ids a request may ask for at most, over all classes
+max_ids = int(getenv("HBNB_API_BATCH_LIMIT", 1000))
+
+
+@app_views.route('/batch/get', methods=['POST'], strict_slashes=False)
+def batch_get():
+    """
+    get the objects of the ids listed by class in the JSON body, by class
+    then by id, leaving out the ids of no object
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        abort(400, description="Not a JSON")
+    for name, ids in data.items():
+        if name not in classes:
+            abort(400, description="Unknown class {}".format(name))
+        if not isinstance(ids, list):
+            abort(400, description="Not a list of ids")
+    if sum(len(ids) for ids in data.values()) > max_ids:
+        abort(400, description="Too many ids")
+    objects = {}
+    for name, ids in data.items():
+        found = storage.get_many(classes[name], ids)
+        objects[name] = {id: obj.to_dict() for id, obj in found.items()}
+    return jsonify(objects)
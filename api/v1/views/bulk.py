@@ -0,0 +1,162 @@
+#!/usr/bin/python3
+"""
+This module defines the view applying many create, update and delete
+operations of the API with a single save.
+
+The body is a list of operations, applied in order:
+    {"op": "create", "class": "City", "data": {"state_id": ..., ...}}
+    {"op": "update", "class": "City", "id": ..., "data": {...}}
+    {"op": "delete", "class": "City", "id": ...}
+They are all checked with the rules of the views of each class, and the
+objects they create or update built, before any is applied, the parents of
+a created object being given in its data. An
+operation may refer to an object created by an earlier one by giving it
+an id in its data.
+"""
+from flask import abort, request
+import json
+from os import getenv
+from api.v1.views import app_views
+from api.v1.views.json_stream import stream_json
+from api.v1.views.rules import rules, update_object
+from models import storage
+# integer - operations a request may hold at most
+max_ops = int(getenv("HBNB_API_BULK_LIMIT", 100000))
+
+
+def _fail(index, message):
+    """rejects the request because of the operation at index"""
+    abort(400, description="Operation {}: {}".format(index, message))
+
+
+def _key(name, id):
+    """returns the key of the object of a class with the given id, None
+    if the id is not a string"""
+    return (name, id) if isinstance(id, str) else None
+
+
+def _referenced(ops):
+    """returns the objects the operations refer to by class and id, read
+    with one get_many per class"""
+    ids = {}
+    for op in ops:
+        if not isinstance(op, dict) or not isinstance(op.get("class"), str) \
+                or op["class"] not in rules:
+            continue
+        name = op["class"]
+        keys = [_key(name, op.get("id"))]
+        data = op.get("data")
+        if isinstance(data, dict):
+            keys.append(_key(name, data.get("id")))
+            keys.extend(_key(parent, data.get(fk))
+                        for fk, parent in rules[name][2])
+        for key in keys:
+            if key is not None:
+                ids.setdefault(key[0], set()).add(key[1])
+    return {(name, id): obj for name in ids
+            for id, obj in storage.get_many(name, ids[name]).items()}
+
+
+def _build(index, cls, data, update=False):
+    """returns an object of cls created from data, or a new one data is
+    set on as an update would; rejects the request at index if the data
+    does not fit the class"""
+    try:
+        if not update:
+            return cls(**data)
+        obj = cls()
+        update_object(obj, data)
+        return obj
+    except (AttributeError, TypeError, ValueError):
+        _fail(index, "Invalid data")
+
+
+def _check(ops):
+    """rejects the request unless every operation can be applied after the
+    ones before it; returns the objects referred to and those the creates
+    build"""
+    objects = _referenced(ops)
+    # dictionary - index of a create -> the object it stores
+    created = {}
+    # set - (class name, id) of the objects once the operations are applied
+    existing = set(objects)
+    for index, op in enumerate(ops):
+        if not isinstance(op, dict):
+            _fail(index, "Not a JSON")
+        if op.get("op") not in ("create", "update", "delete"):
+            _fail(index, "Unknown op")
+        name = op.get("class")
+        if not isinstance(name, str) or name not in rules:
+            _fail(index, "Unknown class")
+        cls, required, parents = rules[name][:3]
+        data = op.get("data", {})
+        if not isinstance(data, dict):
+            _fail(index, "Not a JSON")
+        if op["op"] == "create":
+            for key in required + tuple(fk for fk, parent in parents):
+                if key not in data:
+                    _fail(index, "Missing {}".format(key))
+            for fk, parent in parents:
+                if _key(parent, data[fk]) not in existing:
+                    _fail(index, "{} not found".format(parent))
+            if "id" in data:
+                key = _key(name, data["id"])
+                if key is None or key in existing:
+                    _fail(index, "Invalid id")
+                existing.add(key)
+            created[index] = _build(index, cls, data)
+        elif _key(name, op.get("id")) not in existing:
+            _fail(index, "{} not found".format(name))
+        elif op["op"] == "delete":
+            existing.discard((name, op["id"]))
+        else:
+            _build(index, cls, data, True)
+    return objects, created
+
+
+def _apply(ops, objects, created):
+    """applies the checked operations and returns what the view of each
+    one would have answered"""
+    results = []
+    for index, op in enumerate(ops):
+        name = op["class"]
+        if op["op"] == "create":
+            obj = created[index]
+            storage.new(obj)
+            objects[(name, obj.id)] = obj
+            results.append(obj.to_dict())
+        elif op["op"] == "update":
+            obj = objects[(name, op["id"])]
+            update_object(obj, op.get("data", {}))
+            results.append(obj.to_dict())
+        else:
+            storage.delete(objects.pop((name, op["id"])))
+            results.append({})
+    return results
+
+
+def _encode(result):
+    """returns the JSON bytes of the result of an operation"""
+    return json.dumps(result).encode("utf-8")
+
+
+@app_views.route('/bulk', methods=['POST'], strict_slashes=False)
+def bulk():
+    """
+    applies the list of operations of the JSON body with one save, none of
+    them if one is invalid
+    """
+    ops = request.get_json(silent=True)
+    if not isinstance(ops, list):
+        abort(400, description="Not a JSON")
+    if len(ops) > max_ops:
+        abort(400, description="Too many operations")
+    objects, created = _check(ops)
+    try:
+        results = _apply(ops, objects, created)
+        storage.save()
+    except Exception:
+        # the database engines drop what was not committed
+        storage.close()
+        raise
+    return stream_json(results, _encode)
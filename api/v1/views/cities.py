@@ -3,6 +3,8 @@
 
 from flask import jsonify, abort, request
 from api.v1.views import app_views
+from api.v1.views.paging import paged
+from api.v1.views.rules import check_required, update_object
 from models import storage
 from models.city import City
 from models.state import State
@@ -15,8 +17,7 @@ def get_Cities(state_id):
     state = storage.get(State, state_id)
     if not state:
         abort(404)
-    cities = [city.to_dict() for city in state.cities]
-    return jsonify(cities)
+    return paged(City, "state_id", state.id)
 
 
 @app_views.route('/cities/<city_id>', methods=['GET'], strict_slashes=False)
@@ -49,8 +50,7 @@ def Create_city(state_id):
     if not request.is_json:
         abort(400, description="Not a JSON")
     city_data = request.get_json()
-    if 'name' not in city_data:
-        abort(400, description="Missing name")
+    check_required("City", city_data)
     city_data['state_id'] = state_id
     new_city = City(**city_data)
     storage.new(new_city)
@@ -67,9 +67,6 @@ def update_city(city_id):
     if not request.is_json:
         abort(400, description="Not a JSON")
     update_data = request.get_json()
-    ignored_keys = ['id', 'state_id', 'created_at', 'updated_at']
-    for key, value in update_data.items():
-        if key not in ignored_keys:
-            setattr(city, key, value)
+    update_object(city, update_data)
     storage.save()
     return jsonify(city.to_dict()), 200
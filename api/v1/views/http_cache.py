@@ -0,0 +1,145 @@
+#!/usr/bin/python3
+"""caches the responses of the GET endpoints of app_views
+
+The ETag of a response is made of the generations of the classes its view
+reads, so it changes as soon as one of their objects is changed through the
+storage of this process. Changes made by other processes are not counted,
+so it also changes every HBNB_API_CACHE_TTL seconds. A client sending it
+back in If-None-Match (or a date in If-Modified-Since) is answered 304
+while it holds, and the others are sent the body cached for the URL. No
+Last-Modified date is given during the second of a change, since a date
+cannot tell it from another change in that second.
+"""
+
+from datetime import datetime
+import hashlib
+import json
+from os import getenv
+import time
+from flask import Response, g, request
+from api.v1.views import app_views
+from models.engine import generations
+from models.engine.cache import LRUCache
+
+# dictionary - view -> names of the classes its response is computed from
+dependencies = {
+    "number_of_objects": ("Amenity", "City", "Place", "Review", "State",
+                          "User"),
+    "get_all_states": ("State",),
+    "get_state": ("State",),
+    "get_Cities": ("State", "City"),
+    "get_City": ("City",),
+    "get_amenitys": ("Amenity",),
+    "get_amenity": ("Amenity",),
+    "get_the_users": ("User",),
+    "get_user": ("User",),
+    "get_places": ("City", "Place"),
+    "get_place": ("Place", "Amenity"),
+    "get_place_amenities": ("Place", "Amenity"),
+    "get_the_reviews": ("Place", "Review"),
+    "get_review": ("Review",),
+}
+# float - seconds an ETag holds at most, 0 to only count this process
+ttl = float(getenv("HBNB_API_CACHE_TTL", 10))
+# integer - size in bytes over which a body is not cached
+max_body = int(getenv("HBNB_API_CACHE_MAX_BODY", 1 << 20))
+# headers of a response sent again with its cached body
+kept_headers = ("Content-Type", "Link")
+# LRUCache - full path -> (ETag, headers, body) of the last 200 response
+bodies = LRUCache(int(getenv("HBNB_API_CACHE_SIZE", 256)))
+
+
+def _validators(names):
+    """returns the ETag and the Last-Modified date of the response to the
+    request computed from the objects of the classes names, None for the
+    date if they changed during the current second"""
+    counts, last = generations.generation(names)
+    now = time.time()
+    bucket = int(now // ttl) if ttl > 0 else 0
+    if ttl > 0:
+        last = max(last, datetime.utcfromtimestamp(bucket * ttl))
+    data = json.dumps([names, counts, bucket, request.full_path])
+    etag = hashlib.sha1(data.encode("utf-8")).hexdigest()
+    if last >= datetime.utcfromtimestamp(int(now)):
+        # a date has no microseconds, so it could not tell this change
+        # from one later in the same second
+        return etag, None
+    return etag, last.replace(microsecond=0)
+
+
+def _validate(response, etag, last_modified):
+    """sets the headers a client revalidates response with"""
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.no_cache = True
+    return response
+
+
+def _not_modified(etag, last_modified):
+    """tells whether the client holds the current response"""
+    if request.if_none_match:
+        # or the ETag of the body compressed by http_compression
+        return request.if_none_match.contains(etag) or \
+            any(tag.startswith(etag + "-")
+                for tag in request.if_none_match.as_set())
+    since = request.if_modified_since
+    return since is not None and last_modified is not None and \
+        since.replace(tzinfo=None) >= last_modified
+
+
+def _tee(chunks, key, etag, headers):
+    """yields the chunks of a streamed body, caching it under key once it
+    was sent whole if it is not too large"""
+    body = []
+    size = 0
+    for chunk in chunks:
+        if body is not None:
+            size += len(chunk)
+            if size > max_body:
+                body = None
+            else:
+                body.append(chunk)
+        yield chunk
+    if body is not None:
+        bodies.put(key, (etag, headers, b"".join(body)))
+
+
+@app_views.before_request
+def cached_response():
+    """answers a GET with 304 or with the cached body when they are
+    current"""
+    names = dependencies.get((request.endpoint or "").split(".")[-1])
+    if request.method not in ("GET", "HEAD") or names is None:
+        return None
+    etag, last_modified = _validators(names)
+    if _not_modified(etag, last_modified):
+        g.http_cache = None
+        return _validate(Response(status=304), etag, last_modified)
+    entry = bodies.get(request.full_path)
+    if entry is not None and entry[0] == etag:
+        g.http_cache = None
+        return _validate(Response(entry[2], headers=entry[1]),
+                         etag, last_modified)
+    g.http_cache = (etag, last_modified)
+    return None
+
+
+@app_views.after_request
+def cache_response(response):
+    """sets the ETag of a computed 200 response and caches its body"""
+    validators = g.pop("http_cache", None)
+    if validators is None or response.status_code != 200:
+        return response
+    etag, last_modified = validators
+    _validate(response, etag, last_modified)
+    headers = [(name, value) for name, value in response.headers
+               if name in kept_headers]
+    if response.is_streamed:
+        response.response = _tee(response.iter_encoded(), request.full_path,
+                                 etag, headers)
+    else:
+        body = response.get_data()
+        if len(body) <= max_body:
+            bodies.put(request.full_path, (etag, headers, body))
+    return response
@@ -1,7 +1,8 @@
 #!/usr/bin/python3
 """ creat a flask app"""
 
-from flask import jsonify
+from flask import abort, jsonify
+from os import environ
 from api.v1.views import app_views
 from models import storage
 from models.amenity import Amenity
@@ -29,3 +30,19 @@ def number_of_objects():
         num_objcts[names[i]] = storage.count(classes[i])
 
     return jsonify(num_objcts)
+
+
+@app_views.route('/stats/pool', methods=['GET'], strict_slashes=False)
+def pool_status():
+    """ get the state of the database connection pool """
+    if environ.get('HBNB_TYPE_STORAGE') != "db":
+        abort(404)
+    return jsonify(storage.pool_status())
+
+
+@app_views.route('/stats/cache', methods=['GET'], strict_slashes=False)
+def cache_stats():
+    """ get the counters of the database object cache """
+    if environ.get('HBNB_TYPE_STORAGE') != "db":
+        abort(404)
+    return jsonify(storage.cache_stats())
@@ -0,0 +1,24 @@
+#!/usr/bin/python3
+"""streams JSON arrays of model objects to the client"""
+
+from flask import Response, stream_with_context
+
+
+def stream_json(objects, serialize=None):
+    """returns a response sending the JSON array of objects one item at a
+    time, serialize(obj) giving the JSON bytes of an item (obj.to_json()
+    if None)"""
+    if serialize is None:
+        def serialize(obj):
+            """returns the JSON of a model object"""
+            return obj.to_json()
+
+    def generate():
+        """yields the array piece by piece"""
+        separator = b"["
+        for obj in objects:
+            yield separator + serialize(obj)
+            separator = b", "
+        yield b"[]\n" if separator == b"[" else b"]\n"
+    return Response(stream_with_context(generate()),
+                    mimetype="application/json")
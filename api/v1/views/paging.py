@@ -0,0 +1,88 @@
+#!/usr/bin/python3
+"""pages through the list endpoints with a limit and an opaque cursor
+
+A client asks for ?limit=<n> and follows the Link header (rel="next") of
+each response, whose cursor is the position of the last object sent in the
+(created_at, id) order. Without limit nor cursor the whole list is sent.
+"""
+
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+import json
+from urllib.parse import urlencode
+from flask import abort, request
+from api.v1.views.json_stream import stream_json
+from models import storage
+from models.engine import keyset
+
+
+def encode_cursor(obj):
+    """returns the cursor of the position following obj"""
+    created_at, id = keyset.sort_key(obj)
+    data = json.dumps([created_at.isoformat(), id]).encode("utf-8")
+    return urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """returns the position a cursor stands for"""
+    try:
+        data = urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, id = json.loads(data)
+        if not isinstance(id, str):
+            raise TypeError("id is not a string")
+        created_at = datetime.fromisoformat(created_at)
+        if created_at.tzinfo is not None:
+            # the timestamps of the objects are naive, never compared to it
+            raise ValueError("created_at has a time zone")
+        return created_at, id
+    except (TypeError, ValueError):
+        abort(400, description="Invalid cursor")
+
+
+def page_args():
+    """returns the limit and the position after which the page starts as
+    given by the query string, None for what is not given"""
+    limit = request.args.get("limit")
+    cursor = request.args.get("cursor")
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            abort(400, description="Invalid limit")
+        if limit < 1:
+            abort(400, description="Invalid limit")
+    after = decode_cursor(cursor) if cursor else None
+    return limit, after
+
+
+def paged_response(objects, limit, serialize=None):
+    """returns the response streaming objects, fetched with one more than
+    limit to tell whether a next page exists, with a link to that page;
+    objects may be any iterable when limit is None"""
+    if limit is None or len(objects) <= limit:
+        return stream_json(objects, serialize)
+    objects = objects[:limit]
+    args = request.args.to_dict()
+    args["limit"] = str(limit)
+    args["cursor"] = encode_cursor(objects[-1])
+    response = stream_json(objects, serialize)
+    response.headers["Link"] = '<{}?{}>; rel="next"'.format(
+        request.base_url, urlencode(args))
+    return response
+
+
+def paged(cls, fk=None, parent_id=None, serialize=None):
+    """returns the response listing the requested page of the objects of a
+    class, only those whose foreign key fk is parent_id if fk is given"""
+    limit, after = page_args()
+    objects = storage.page(cls, None if limit is None else limit + 1, after,
+                           fk, parent_id)
+    return paged_response(objects, limit, serialize)
+
+
+def paged_list(objects, serialize=None):
+    """returns the response listing the requested page of objects"""
+    limit, after = page_args()
+    objects = keyset.page(objects, None if limit is None else limit + 1,
+                          after)
+    return paged_response(objects, limit, serialize)
@@ -3,13 +3,14 @@
 This module defines the views for the Place object in the API.
 """
 from flask import jsonify, abort, request
+import json
 from api.v1.views import app_views
+from api.v1.views.paging import paged, paged_list
+from api.v1.views.rules import check_required, update_object
 from models import storage
 from models.place import Place
 from models.city import City
 from models.user import User
-from models.state import State
-from models.amenity import Amenity
 
 
 @app_views.route('/cities/<city_id>/places',
@@ -21,8 +22,7 @@ def get_places(city_id):
     city = storage.get(City, city_id)
     if not city:
         abort(404)
-    places = [place.to_dict() for place in city.places]
-    return jsonify(places)
+    return paged(Place, "city_id", city.id)
 
 
 @app_views.route('/places/<place_id>', methods=['GET'], strict_slashes=False)
@@ -70,8 +70,7 @@ def create_place(city_id):
     if not user:
         abort(404)
 
-    if 'name' not in place_data:
-        abort(400, description="Missing name")
+    check_required("Place", place_data)
 
     new_place = Place(**place_data)
     new_place.city_id = city_id
@@ -93,10 +92,7 @@ def update_place(place_id):
         abort(400, description="Not a JSON")
     update_data = request.get_json()
 
-    ignored_keys = ['id', 'user_id', 'city_id', 'created_at', 'updated_at']
-    for key, value in update_data.items():
-        if key not in ignored_keys:
-            setattr(place, key, value)
+    update_object(place, update_data)
     storage.save()
     return jsonify(place.to_dict()), 200
 
@@ -118,41 +114,14 @@ def places_search():
             not states and
             not cities and
             not amenities):
-        places = storage.all(Place).values()
-        list_places = []
-        for place in places:
-            list_places.append(place.to_dict())
-        return jsonify(list_places)
-
-    list_places = []
-    if states:
-        states_obj = [storage.get(State, s_id) for s_id in states]
-        for state in states_obj:
-            if state:
-                for city in state.cities:
-                    if city:
-                        for place in city.places:
-                            list_places.append(place)
-
-    if cities:
-        city_obj = [storage.get(City, c_id) for c_id in cities]
-        for city in city_obj:
-            if city:
-                for place in city.places:
-                    if place not in list_places:
-                        list_places.append(place)
-
-    if amenities:
-        if not list_places:
-            list_places = storage.all(Place).values()
-        amenities_obj = [storage.get(Amenity, a_id) for a_id in amenities]
-        list_places = [place for place in list_places
-                       if all([am in place.amenities
-                               for am in amenities_obj])]
-
-    places = []
-    for p in list_places:
-        d = p.to_dict()
-        d.pop('amenities', None)
-        places.append(d)
-    return jsonify(places)
+        return paged(Place)
+
+    list_places = storage.search(states, cities, amenities)
+    return paged_list(list_places, _place_json)
+
+
+def _place_json(place):
+    """returns the JSON bytes of a place without its loaded amenities"""
+    d = place.to_dict()
+    d.pop('amenities', None)
+    return json.dumps(d).encode("utf-8")
@@ -48,7 +48,9 @@ def delete_place_amenity(place_id, amenity_id):
     else:
         if amenity_id not in place.amenity_ids:
             abort(404)
-        place.amenity_ids.remove(amenity_id)
+        # reassigned rather than mutated so the place is marked as changed
+        place.amenity_ids = [a_id for a_id in place.amenity_ids
+                             if a_id != amenity_id]
 
     storage.save()
     return make_response(jsonify({}), 200)
@@ -77,7 +79,7 @@ def post_place_amenity(place_id, amenity_id):
         if amenity_id in place.amenity_ids:
             return make_response(jsonify(amenity.to_dict()), 200)
         else:
-            place.amenity_ids.append(amenity_id)
+            place.amenity_ids = place.amenity_ids + [amenity_id]
 
     storage.save()
     return make_response(jsonify(amenity.to_dict()), 201)
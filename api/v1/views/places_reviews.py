@@ -4,6 +4,8 @@ This module defines the views for the Review object in the API
 """
 from flask import jsonify, abort, request
 from api.v1.views import app_views
+from api.v1.views.paging import paged
+from api.v1.views.rules import check_required, update_object
 from models import storage
 from models.review import Review
 from models.place import Place
@@ -19,8 +21,7 @@ def get_the_reviews(place_id):
     place = storage.get(Place, place_id)
     if not place:
         abort(404)
-    reviews = [review.to_dict() for review in place.reviews]
-    return jsonify(reviews)
+    return paged(Review, "place_id", place.id)
 
 
 @app_views.route('/reviews/<review_id>', methods=['GET'], strict_slashes=False)
@@ -68,8 +69,7 @@ def create_review(place_id):
     if not user:
         abort(404)
 
-    if 'text' not in review_data:
-        abort(400, description="Missing text")
+    check_required("Review", review_data)
 
     new_review = Review(**review_data)
     new_review.place_id = place_id
@@ -91,9 +91,6 @@ def update_review(review_id):
         abort(400, description="Not a JSON")
     update_data = request.get_json()
 
-    ignored_keys = ['id', 'user_id', 'place_id', 'created_at', 'updated_at']
-    for key, value in update_data.items():
-        if key not in ignored_keys:
-            setattr(review, key, value)
+    update_object(review, update_data)
     storage.save()
     return jsonify(review.to_dict()), 200
@@ -0,0 +1,46 @@
+#!/usr/bin/python3
+"""
+This module defines the rules the views of each class, and the bulk view,
+check the JSON bodies of the requests against.
+"""
+from flask import abort
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+
+# keys an update of any class ignores
+ignored_keys = ("id", "created_at", "updated_at")
+# dictionary - class name -> (class, keys required to create an object,
+# foreign keys of the parents it is created under, keys an update ignores)
+rules = {
+    "Amenity": (Amenity, ("name",), (), ignored_keys),
+    "City": (City, ("name",), (("state_id", "State"),),
+             ignored_keys + ("state_id",)),
+    "Place": (Place, ("name",), (("city_id", "City"), ("user_id", "User")),
+              ignored_keys + ("user_id", "city_id")),
+    "Review": (Review, ("text",), (("place_id", "Place"),
+                                   ("user_id", "User")),
+               ignored_keys + ("user_id", "place_id")),
+    "State": (State, ("name",), (), ignored_keys),
+    "User": (User, ("email", "password"), (), ignored_keys + ("email",)),
+}
+
+
+def check_required(name, data):
+    """aborts with a 400 unless data holds every key required to create an
+    object of the class name"""
+    for key in rules[name][1]:
+        if key not in data:
+            abort(400, description="Missing {}".format(key))
+
+
+def update_object(obj, data):
+    """sets the values of data on obj, but for the keys an update of its
+    class ignores"""
+    ignored = rules[obj.__class__.__name__][3]
+    for key, value in data.items():
+        if key not in ignored:
+            setattr(obj, key, value)
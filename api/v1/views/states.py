@@ -3,6 +3,8 @@
 
 from flask import jsonify, abort, request
 from api.v1.views import app_views
+from api.v1.views.paging import paged
+from api.v1.views.rules import check_required, update_object
 from models import storage
 from models.state import State
 
@@ -10,8 +12,7 @@ from models.state import State
 @app_views.route('/states', methods=['GET'], strict_slashes=False)
 def get_all_states():
     """Retrieves the list of all State objects"""
-    states = storage.all(State).values()
-    return jsonify([state.to_dict() for state in states])
+    return paged(State)
 
 
 @app_views.route('/states/<state_id>', methods=['GET'], strict_slashes=False)
@@ -41,8 +42,7 @@ def create_state():
     if not request.is_json:
         abort(400, description="Not a JSON")
     state_data = request.get_json()
-    if 'name' not in state_data:
-        abort(400, description="Missing name")
+    check_required("State", state_data)
     new_state = State(**state_data)
     storage.new(new_state)
     storage.save()
@@ -58,9 +58,6 @@ def update_state(state_id):
     if not request.is_json:
         abort(400, description="Not a JSON")
     update_data = request.get_json()
-    ignored_keys = ['id', 'created_at', 'updated_at']
-    for key, value in update_data.items():
-        if key not in ignored_keys:
-            setattr(state, key, value)
+    update_object(state, update_data)
     storage.save()
     return jsonify(state.to_dict()), 200
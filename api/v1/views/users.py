@@ -4,6 +4,8 @@ This module defines the views for the User object in the API.
 """
 from flask import jsonify, abort, request
 from api.v1.views import app_views
+from api.v1.views.paging import paged
+from api.v1.views.rules import check_required, update_object
 from models import storage
 from models.user import User
 
@@ -13,8 +15,7 @@ def get_the_users():
     """
     Retrieves the list of all User objects
     """
-    users = [user.to_dict() for user in storage.all(User).values()]
-    return jsonify(users)
+    return paged(User)
 
 
 @app_views.route('/users/<user_id>', methods=['GET'], strict_slashes=False)
@@ -49,10 +50,7 @@ def creates_user():
     if not request.is_json:
         abort(400, description="Not a JSON")
     user_data = request.get_json()
-    if 'email' not in user_data:
-        abort(400, description="Missing email")
-    if 'password' not in user_data:
-        abort(400, description="Missing password")
+    check_required("User", user_data)
     new_user = User(**user_data)
     storage.new(new_user)
     storage.save()
@@ -70,9 +68,6 @@ def update_user(user_id):
     if not request.is_json:
         abort(400, description="Not a JSON")
     update_data = request.get_json()
-    ignored_keys = ['id', 'email', 'created_at', 'updated_at']
-    for key, value in update_data.items():
-        if key not in ignored_keys:
-            setattr(user, key, value)
+    update_object(user, update_data)
     storage.save()
     return jsonify(user.to_dict()), 200
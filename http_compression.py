@@ -0,0 +1,143 @@
+#!/usr/bin/python3
+"""compresses the responses of a flask app as the client accepts
+
+Bodies of compressible types reaching HBNB_COMPRESS_MIN_SIZE bytes are
+sent with the best of zstd (when zstandard is installed), gzip and deflate
+the request accepts. Streamed bodies are compressed as they are sent. A
+response with an ETag gets the encoding appended to it, and its compressed
+body is cached under that ETag so it is only compressed once.
+"""
+
+from itertools import chain
+from os import getenv
+import zlib
+from flask import request
+from models.engine.cache import LRUCache
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# integer - size in bytes under which a body is sent as is
+min_size = int(getenv("HBNB_COMPRESS_MIN_SIZE", 1024))
+# integer - zlib level of gzip and deflate, 1 (fast) to 9 (small)
+level = int(getenv("HBNB_COMPRESS_LEVEL", 6))
+# integer - level of zstd, 1 (fast) to 22 (small)
+zstd_level = int(getenv("HBNB_ZSTD_LEVEL", 3))
+# types of the bodies worth compressing, besides text/*
+compressible = ("application/json", "application/javascript",
+                "application/xml", "image/svg+xml")
+# encodings offered, the preferred first
+encodings = (("zstd",) if zstandard else ()) + ("gzip", "deflate")
+# integer - size in bytes over which a compressed body is not cached
+max_body = int(getenv("HBNB_COMPRESS_CACHE_MAX_BODY", 1 << 20))
+# LRUCache - ETag with its encoding -> compressed body
+bodies = LRUCache(int(getenv("HBNB_COMPRESS_CACHE_SIZE", 256)))
+
+
+def compressor(encoding):
+    """returns a new object compressing a body with encoding, with the
+    compress and flush methods of zlib"""
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=zstd_level).compressobj()
+    # gzip and zlib (what HTTP calls deflate) containers
+    return zlib.compressobj(level, zlib.DEFLATED,
+                            31 if encoding == "gzip" else 15)
+
+
+def compress(data, encoding):
+    """returns data compressed with encoding"""
+    stream = compressor(encoding)
+    return stream.compress(data) + stream.flush()
+
+
+def compress_chunks(chunks, encoding, etag=None):
+    """yields the chunks compressed with encoding as they come, caching the
+    whole compressed body under etag if it is given and not too large"""
+    stream = compressor(encoding)
+    body = [] if etag else None
+    size = 0
+    for chunk in chain(chunks, [None]):
+        data = stream.flush() if chunk is None else stream.compress(chunk)
+        if body is not None:
+            size += len(data)
+            if size > max_body:
+                body = None
+            else:
+                body.append(data)
+        if data:
+            yield data
+    if body is not None:
+        bodies.put(etag, b"".join(body))
+
+
+def _encoded_etag(response, encoding):
+    """returns the ETag of the response once encoded, None if it has no
+    strong ETag"""
+    etag, weak = response.get_etag()
+    if etag is None or weak:
+        return None
+    return "{}-{}".format(etag, encoding)
+
+
+def _read_ahead(response):
+    """returns the first chunks of a streamed response up to min_size bytes
+    and the iterator of the others, None once it is exhausted"""
+    chunks = iter(response.iter_encoded())
+    head = []
+    size = 0
+    for chunk in chunks:
+        head.append(chunk)
+        size += len(chunk)
+        if size >= min_size:
+            return head, chunks
+    return head, None
+
+
+def compress_response(response):
+    """compresses the body of response with the best encoding the request
+    accepts, if it is worth it"""
+    mimetype = response.mimetype or ""
+    if mimetype not in compressible and not mimetype.startswith("text/"):
+        return response
+    response.vary.add("Accept-Encoding")
+    encoding = request.accept_encodings.best_match(encodings)
+    if encoding is None:
+        return response
+    if response.status_code == 304:
+        etag = _encoded_etag(response, encoding)
+        if etag is not None and request.if_none_match.contains(etag):
+            response.set_etag(etag)
+        return response
+    if response.status_code != 200 or response.direct_passthrough or \
+            "Content-Encoding" in response.headers:
+        return response
+    etag = _encoded_etag(response, encoding)
+    if not response.is_streamed:
+        data = response.get_data()
+        if len(data) < min_size:
+            return response
+        body = bodies.get(etag) if etag else None
+        if body is None:
+            body = compress(data, encoding)
+            if etag and len(body) <= max_body:
+                bodies.put(etag, body)
+        response.set_data(body)
+    else:
+        head, rest = _read_ahead(response)
+        if rest is None:
+            # short enough to be sent whole
+            response.set_data(b"".join(head))
+            return compress_response(response)
+        response.response = compress_chunks(chain(head, rest), encoding,
+                                            etag)
+        response.headers.pop("Content-Length", None)
+    response.headers["Content-Encoding"] = encoding
+    if etag:
+        response.set_etag(etag)
+    return response
+
+
+def init_app(app):
+    """compresses the responses of app"""
+    app.after_request(compress_response)
@@ -4,14 +4,19 @@ Contains class BaseModel
 """
 
 from datetime import datetime
+import json
 import models
 from os import getenv
 import sqlalchemy
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, String, DateTime, Index
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import declared_attr
 import uuid
+import weakref
 
 time = "%Y-%m-%dT%H:%M:%S.%f"
+# instances changed since the storage engine last persisted them
+dirty = weakref.WeakSet()
 
 if models.storage_t == "db":
     Base = declarative_base()
@@ -19,6 +24,26 @@ else:
     Base = object
 
 
+def _parse_time(value):
+    """returns the datetime of a timestamp written by to_dict(), for the
+    storage engines only: it is not as strict as strptime"""
+    try:
+        # parses the format of to_dict() far faster than strptime
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return datetime.strptime(value, time)
+    if parsed.tzinfo is not None:
+        # never compared with the naive timestamps of the other objects
+        raise ValueError("{} has a time zone".format(value))
+    return parsed
+
+
+def _format_time(value):
+    """returns a datetime in the format of time, several times faster than
+    strftime"""
+    return value.isoformat(timespec="microseconds")
+
+
 class BaseModel:
     """The BaseModel class from which future classes will be derived"""
     if models.storage_t == "db":
@@ -26,6 +51,12 @@ class BaseModel:
         created_at = Column(DateTime, default=datetime.utcnow)
         updated_at = Column(DateTime, default=datetime.utcnow)
 
+        @declared_attr
+        def __table_args__(cls):
+            """indexes the (created_at, id) order the pages follow"""
+            return (Index('ix_{}_created_at_id'.format(cls.__tablename__),
+                          'created_at', 'id'),)
+
     def __init__(self, *args, **kwargs):
         """Initialization of the base model"""
         if kwargs:
@@ -47,6 +78,35 @@ class BaseModel:
             self.created_at = datetime.utcnow()
             self.updated_at = self.created_at
 
+    @classmethod
+    def from_storage_dict(cls, value):
+        """builds an instance from a dictionary written by to_dict(), filling
+        its __dict__ at once instead of going through __init__"""
+        if models.storage_t == "db":
+            return cls(**value)
+        attrs = {}
+        for key, item in value.items():
+            if type(item) is list or type(item) is dict:
+                # not shared with the dictionary the storage keeps
+                item = item.copy()
+            attrs[key] = item
+        attrs.pop("__class__", None)
+        for key in ("created_at", "updated_at"):
+            if attrs.get(key, None) and type(attrs[key]) is str:
+                attrs[key] = _parse_time(attrs[key])
+            else:
+                attrs[key] = datetime.utcnow()
+        if attrs.get("id", None) is None:
+            attrs["id"] = str(uuid.uuid4())
+        obj = cls.__new__(cls)
+        obj.__dict__.update(attrs)
+        return obj
+
+    def __setattr__(self, name, value):
+        """sets an attribute and marks the instance as changed"""
+        super().__setattr__(name, value)
+        dirty.add(self)
+
     def __str__(self):
         """String representation of the BaseModel class"""
         return "[{:s}] ({:s}) {}".format(self.__class__.__name__, self.id,
@@ -62,17 +122,20 @@ class BaseModel:
         """returns the dictionary containing all keys/values of the instance"""
         newdict = self.__dict__.copy()
         if "created_at" in newdict:
-            newdict["created_at"] = newdict["created_at"].strftime(time)
+            newdict["created_at"] = _format_time(newdict["created_at"])
         if "updated_at" in newdict:
-            newdict["updated_at"] = newdict["updated_at"].strftime(time)
+            newdict["updated_at"] = _format_time(newdict["updated_at"])
         newdict["__class__"] = self.__class__.__name__
-        if "_sa_instance_state" in newdict:
-            del newdict["_sa_instance_state"]
+        newdict.pop("_sa_instance_state", None)
         if save_to_dict is None:
-            if "password" in newdict:
-                del newdict["password"]
+            newdict.pop("password", None)
         return newdict
 
+    def to_json(self, save_to_dict=None):
+        """returns to_dict() encoded as UTF-8 JSON bytes, ready to be
+        written to a response or a file"""
+        return json.dumps(self.to_dict(save_to_dict)).encode("utf-8")
+
     def delete(self):
         """delete the current instance from the storage"""
         models.storage.delete(self)
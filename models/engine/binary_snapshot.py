@@ -0,0 +1,348 @@
+#!/usr/bin/python3
+"""
+Contains the compact binary snapshot format of FileStorage
+
+The file starts with MAGIC and holds one section per class:
+    class name, column names with their kind, record count, then records
+Each record is prefixed with its length, so that it can be decoded alone.
+It holds the id and the columns of the class whose values are all strings
+as one NUL-separated text, then created_at, updated_at (as microseconds
+since the epoch) and the columns whose values are all integers, floats or
+booleans in the fixed-width layout of one struct, then one tagged value per
+remaining column. Most records are thus decoded with one UTF-8 decode, one
+split and one unpack.
+
+usage: python3 -m models.engine.binary_snapshot <source> <destination>
+converts a JSON file to the binary format or the other way around
+"""
+
+from datetime import datetime, timedelta
+import json
+import struct
+import sys
+
+MAGIC = b"HBNB\x01"
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+# created_at or updated_at absent from the record
+NO_TIME = -(1 << 63)
+# dictionary - seconds since the epoch -> their timestamp, as the objects
+# of a file are often created in the same seconds
+_seconds = {}
+
+_u16 = struct.Struct("<H")
+_u32 = struct.Struct("<I")
+_i64 = struct.Struct("<q")
+_f64 = struct.Struct("<d")
+
+# tags of the column values
+MISSING, NONE, STR, INT, FLOAT, TRUE, FALSE, JSON = range(8)
+# kinds of the columns: their struct format, or TEXT, LIST or TAGGED
+TEXT = "s"
+LIST = "l"
+TAGGED = "v"
+# separator of the strings of a LIST column
+LIST_SEP = "\x01"
+# value of a column an object does not have, when choosing its kind
+_MISSING = object()
+
+
+def _to_micros(value):
+    """returns a timestamp string as microseconds since the epoch, or None
+    if it is not one"""
+    if not isinstance(value, str):
+        return None
+    try:
+        micros = (datetime.fromisoformat(value) - EPOCH) // MICROSECOND
+    except (TypeError, ValueError):
+        return None
+    if _from_micros(micros) != value:
+        # kept as a column so that it reads back exactly as written
+        return None
+    return micros
+
+
+def _from_micros(micros):
+    """returns microseconds since the epoch as a to_dict() timestamp"""
+    seconds, micros = divmod(micros, 1000000)
+    prefix = _seconds.get(seconds)
+    if prefix is None:
+        if len(_seconds) >= 4096:
+            _seconds.clear()
+        prefix = (EPOCH + timedelta(seconds=seconds)).isoformat() + "."
+        _seconds[seconds] = prefix
+    # cheaper than formatting with %06d
+    return prefix + str(1000000 + micros)[1:]
+
+
+def _text(value):
+    """returns a string prefixed with its length"""
+    data = value.encode("utf-8")
+    return _u32.pack(len(data)) + data
+
+
+def _value(value):
+    """returns a tagged column value"""
+    if value is None:
+        return bytes((NONE,))
+    if value is True:
+        return bytes((TRUE,))
+    if value is False:
+        return bytes((FALSE,))
+    if type(value) is str:
+        return bytes((STR,)) + _text(value)
+    if type(value) is int and -(1 << 63) <= value < (1 << 63):
+        return bytes((INT,)) + _i64.pack(value)
+    if type(value) is float:
+        return bytes((FLOAT,)) + _f64.pack(value)
+    return bytes((JSON,)) + _text(json.dumps(value))
+
+
+def _split(value):
+    """separates a serialized object into its id, timestamps and the
+    remaining columns"""
+    columns = dict(value)
+    del columns["__class__"]
+    times = []
+    for name in ("created_at", "updated_at"):
+        micros = _to_micros(columns.get(name))
+        if micros is None:
+            times.append(NO_TIME)
+        else:
+            times.append(micros)
+            del columns[name]
+    return columns.pop("id"), times, columns
+
+
+def _kind(values):
+    """returns the kind of the column holding values, TAGGED unless they all
+    have the same fixed-width type or are all strings"""
+    types = set(type(value) for value in values)
+    if types == {str} and not any("\0" in value for value in values):
+        return TEXT
+    if types == {list} and all(type(item) is str and item and
+                               "\0" not in item and LIST_SEP not in item
+                               for value in values for item in value):
+        return LIST
+    if types == {int} and \
+            all(-(1 << 63) <= value < (1 << 63) for value in values):
+        return "q"
+    if types == {float}:
+        return "d"
+    if types == {bool}:
+        return "?"
+    return TAGGED
+
+
+class Layout:
+    """columns of the records of a class, grouped by how they are read"""
+
+    def __init__(self, name, columns, kinds):
+        """compiles the struct of the fixed-width columns"""
+        self.name = name
+        self.columns = tuple(columns)
+        self.kinds = tuple(kinds)
+        self.texts = ("id",) + tuple(column for column, kind
+                                     in zip(columns, kinds) if kind == TEXT)
+        self.lists = tuple(column for column, kind in zip(columns, kinds)
+                           if kind == LIST)
+        self.fixed = tuple(column for column, kind in zip(columns, kinds)
+                           if kind not in (TEXT, LIST, TAGGED))
+        self.tagged = tuple(column for column, kind in zip(columns, kinds)
+                            if kind == TAGGED)
+        self.struct = struct.Struct("<qq" + "".join(
+            kind for kind in kinds if kind not in (TEXT, LIST, TAGGED)))
+        # keys of the texts of a record, then of the values of its struct
+        self.keys = self.texts + self.lists + \
+            ("created_at", "updated_at") + self.fixed
+
+    def encode(self, id, times, columns):
+        """returns the record of an object"""
+        texts = [id] + [columns[column] for column in self.texts[1:]]
+        texts.extend(LIST_SEP.join(columns[column]) for column in self.lists)
+        data = "\0".join(texts).encode("utf-8")
+        record = [_u32.pack(len(data)), data,
+                  self.struct.pack(*times, *(columns[column]
+                                             for column in self.fixed))]
+        for column in self.tagged:
+            if column in columns:
+                record.append(_value(columns[column]))
+            else:
+                record.append(bytes((MISSING,)))
+        return b"".join(record)
+
+    def decode(self, buf, offset):
+        """returns the serialized object of the record at offset"""
+        size = _u32.unpack_from(buf, offset)[0]
+        offset += 4
+        end = offset + size
+        value = dict(zip(self.keys, (
+            *str(buf[offset:end], "utf-8").split("\0"),
+            *self.struct.unpack_from(buf, end))))
+        value["__class__"] = self.name
+        created_at = value["created_at"]
+        updated_at = value["updated_at"]
+        if created_at == NO_TIME:
+            del value["created_at"]
+        else:
+            value["created_at"] = _from_micros(created_at)
+        if updated_at == NO_TIME:
+            del value["updated_at"]
+        elif updated_at == created_at:
+            value["updated_at"] = value["created_at"]
+        else:
+            value["updated_at"] = _from_micros(updated_at)
+        for column in self.lists:
+            text = value[column]
+            value[column] = text.split(LIST_SEP) if text else []
+        if self.tagged:
+            _decode_tagged(buf, end + self.struct.size, self.tagged, value)
+        return value
+
+
+def dump(json_objects, f):
+    """writes the serialized objects of json_objects to the binary file f"""
+    sections = {}
+    for value in json_objects.values():
+        sections.setdefault(value["__class__"], []).append(_split(value))
+    f.write(MAGIC)
+    for name, records in sections.items():
+        columns = sorted({column for record in records
+                          for column in record[2]})
+        kinds = []
+        for column in columns:
+            values = [record[2].get(column, _MISSING) for record in records]
+            if column in ("created_at", "updated_at"):
+                # timestamps _to_micros could not hold, read after the
+                # struct so that they replace its NO_TIME
+                kinds.append(TAGGED)
+            else:
+                kinds.append(_kind(values))
+        if any("\0" in record[0] for record in records):
+            raise ValueError("an id holds a NUL character")
+        layout = Layout(name, columns, kinds)
+        chunks = [_text(name), _u16.pack(len(columns))]
+        for column, kind in zip(columns, kinds):
+            chunks.append(_text(column) + kind.encode("ascii"))
+        chunks.append(_u32.pack(len(records)))
+        for record in records:
+            data = layout.encode(*record)
+            chunks.append(_u32.pack(len(data)))
+            chunks.append(data)
+        f.write(b"".join(chunks))
+
+
+def _read_text(buf, offset):
+    """returns the string at offset and the offset following it"""
+    size = _u32.unpack_from(buf, offset)[0]
+    offset += 4
+    return str(buf[offset:offset + size], "utf-8"), offset + size
+
+
+def _record_id(buf, offset):
+    """returns the id of the record at offset"""
+    size = _u32.unpack_from(buf, offset)[0]
+    offset += 4
+    end = buf.find(b"\0", offset, offset + size)
+    return str(buf[offset:offset + size if end < 0 else end], "utf-8")
+
+
+def _sections(buf):
+    """yields (class name, layout, offsets of the records) for every class
+    of the binary snapshot in buf"""
+    if buf[:len(MAGIC)] != MAGIC:
+        raise ValueError("not a binary snapshot")
+    offset = len(MAGIC)
+    end = len(buf)
+    while offset < end:
+        name, offset = _read_text(buf, offset)
+        count = _u16.unpack_from(buf, offset)[0]
+        offset += 2
+        columns = []
+        kinds = []
+        for i in range(count):
+            column, offset = _read_text(buf, offset)
+            columns.append(column)
+            kinds.append(chr(buf[offset]))
+            offset += 1
+        layout = Layout(name, columns, kinds)
+        count = _u32.unpack_from(buf, offset)[0]
+        offset += 4
+        offsets = []
+        for i in range(count):
+            offsets.append(offset + 4)
+            offset += 4 + _u32.unpack_from(buf, offset)[0]
+        yield name, layout, offsets
+
+
+def scan(buf):
+    """yields (class name, layout, id, offset, length) for every record of
+    the binary snapshot in buf, without decoding its columns"""
+    for name, layout, offsets in _sections(buf):
+        for offset in offsets:
+            length = _u32.unpack_from(buf, offset - 4)[0]
+            yield name, layout, _record_id(buf, offset), offset, length
+
+
+def _decode_tagged(buf, offset, columns, value):
+    """reads the tagged values of columns at offset into value and returns
+    the offset following them"""
+    for column in columns:
+        tag = buf[offset]
+        offset += 1
+        if tag == MISSING:
+            continue
+        elif tag == NONE:
+            value[column] = None
+        elif tag == TRUE:
+            value[column] = True
+        elif tag == FALSE:
+            value[column] = False
+        elif tag == INT:
+            value[column] = _i64.unpack_from(buf, offset)[0]
+            offset += 8
+        elif tag == FLOAT:
+            value[column] = _f64.unpack_from(buf, offset)[0]
+            offset += 8
+        else:
+            text, offset = _read_text(buf, offset)
+            value[column] = text if tag == STR else json.loads(text)
+    return offset
+
+
+def decode(buf, name, layout, offset):
+    """returns the serialized object of the record at offset of the class
+    name, whose layout scan gave"""
+    return layout.decode(buf, offset)
+
+
+def load(buf):
+    """returns the serialized objects of the binary snapshot in buf by
+    <class name>.id"""
+    json_objects = {}
+    for name, layout, offsets in _sections(buf):
+        prefix = name + "."
+        for offset in offsets:
+            value = layout.decode(buf, offset)
+            json_objects[prefix + value["id"]] = value
+    return json_objects
+
+
+def convert(src, dst):
+    """converts the file src to dst, from JSON to binary or the other way
+    around depending on the format of src"""
+    with open(src, "rb") as f:
+        data = f.read()
+    if data.startswith(MAGIC):
+        with open(dst, "w") as f:
+            json.dump(load(data), f)
+    else:
+        with open(dst, "wb") as f:
+            dump(json.loads(data.decode("utf-8")), f)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("usage: {} <source> <destination>".format(sys.argv[0]))
+        sys.exit(1)
+    convert(sys.argv[1], sys.argv[2])
@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+"""
+Contains the LRUCache class, the object cache of DBStorage
+"""
+
+from collections import OrderedDict
+import threading
+import time
+
+
+class LRUCache:
+    """bounded mapping shared by the threads of a process, dropping the
+    least recently used entries and those older than ttl seconds"""
+
+    def __init__(self, maxsize, ttl=None):
+        """initializes an empty cache of at most maxsize entries"""
+        self.__maxsize = maxsize
+        self.__ttl = ttl
+        self.__lock = threading.Lock()
+        # OrderedDict - key -> (expiry time, value), least recent first
+        self.__entries = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__expirations = 0
+
+    def get(self, key, default=None):
+        """returns the value of key, or default if it is not cached"""
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry[0] is not None and \
+                    entry[0] <= time.monotonic():
+                del self.__entries[key]
+                self.__expirations += 1
+                entry = None
+            if entry is None:
+                self.__misses += 1
+                return default
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        """caches value under key, evicting the least recently used entries
+        past maxsize"""
+        if self.__maxsize <= 0:
+            return
+        expiry = None
+        if self.__ttl is not None:
+            expiry = time.monotonic() + self.__ttl
+        with self.__lock:
+            self.__entries[key] = (expiry, value)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__maxsize:
+                self.__entries.popitem(last=False)
+                self.__evictions += 1
+
+    def pop(self, key):
+        """drops the entry of key if there is one"""
+        with self.__lock:
+            self.__entries.pop(key, None)
+
+    def clear(self):
+        """drops every entry"""
+        with self.__lock:
+            self.__entries.clear()
+
+    def stats(self):
+        """returns the size of the cache and its counters"""
+        with self.__lock:
+            return {"size": len(self.__entries),
+                    "maxsize": self.__maxsize,
+                    "ttl": self.__ttl,
+                    "hits": self.__hits,
+                    "misses": self.__misses,
+                    "evictions": self.__evictions,
+                    "expirations": self.__expirations}
@@ -0,0 +1,27 @@
+#!/usr/bin/python3
+"""
+Brings the schema of an existing database up to the models
+
+reload() creates the tables that are missing with their indexes, but leaves
+the existing tables as they are; this adds the indexes they lack.
+
+usage: HBNB_TYPE_STORAGE=db python3 -m models.engine.db_migrate
+with the HBNB_MYSQL_* variables of the database set as for the API
+"""
+
+import sys
+import models
+
+
+def migrate():
+    """creates what the database lacks and returns the names of the indexes
+    created"""
+    return models.storage.migrate()
+
+
+if __name__ == "__main__":
+    if models.storage_t != "db":
+        print("** HBNB_TYPE_STORAGE must be db **")
+        sys.exit(1)
+    for name in migrate():
+        print("created index {}".format(name))
@@ -0,0 +1,54 @@
+#!/usr/bin/python3
+"""
+Contains the MeteredQueuePool class, the connection pool of DBStorage
+"""
+
+import threading
+import time
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool measuring how long checkouts wait for a connection"""
+
+    def __init__(self, *args, **kwargs):
+        """initializes the pool with its metrics at zero"""
+        super().__init__(*args, **kwargs)
+        self.__metrics_lock = threading.Lock()
+        self.__checkouts = 0
+        self.__timeouts = 0
+        self.__wait = 0.0
+        self.__max_wait = 0.0
+
+    def _do_get(self):
+        """checks a connection out of the pool, timing the wait"""
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with self.__metrics_lock:
+                self.__checkouts += 1
+                self.__timeouts += timed_out
+                self.__wait += waited
+                self.__max_wait = max(self.__max_wait, waited)
+
+    def metrics(self):
+        """returns the state of the pool and its checkout counters"""
+        with self.__metrics_lock:
+            checkouts = self.__checkouts
+            return {"size": self.size(),
+                    "checked_in": self.checkedin(),
+                    "checked_out": self.checkedout(),
+                    "overflow": max(self.overflow(), 0),
+                    "max_overflow": self._max_overflow,
+                    "checkouts": checkouts,
+                    "timeouts": self.__timeouts,
+                    "wait_total": self.__wait,
+                    "wait_max": self.__max_wait,
+                    "wait_avg": self.__wait / checkouts if checkouts else 0.0}
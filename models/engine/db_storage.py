@@ -7,23 +7,38 @@ import models
 from models.amenity import Amenity
 from models.base_model import BaseModel, Base
 from models.city import City
+from models.engine.cache import LRUCache
+from models.engine import generations
+from models.engine.db_pool import MeteredQueuePool
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
 from os import getenv
 import sqlalchemy
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy import (and_, create_engine, distinct, func, or_, select,
+                        union_all)
+from sqlalchemy.orm import (make_transient_to_detached, scoped_session,
+                            selectinload, sessionmaker)
+from sqlalchemy.orm.util import identity_key
 
 classes = {"Amenity": Amenity, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+# small reference tables whose rows get() and all() read through the cache
+cached_classes = (Amenity, City, State)
 
 
 class DBStorage:
     """interaacts with the MySQL database"""
     __engine = None
     __session = None
+    # integer - rows fetched per round trip by iter_all and page
+    __batch_size = int(getenv('HBNB_MYSQL_BATCH_SIZE', 1000))
+    # integer - objects of cached_classes the cache holds, 0 to disable it
+    __cache_size = int(getenv('HBNB_CACHE_SIZE', 1024))
+    # float - seconds a cached object is served for, since other processes
+    # may change it, 0 to never expire
+    __cache_ttl = float(getenv('HBNB_CACHE_TTL', 60))
 
     def __init__(self):
         """Instantiate a DBStorage object"""
@@ -32,37 +47,109 @@ class DBStorage:
         HBNB_MYSQL_HOST = getenv('HBNB_MYSQL_HOST')
         HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
         HBNB_ENV = getenv('HBNB_ENV')
-        self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.
-                                      format(HBNB_MYSQL_USER,
-                                             HBNB_MYSQL_PWD,
-                                             HBNB_MYSQL_HOST,
-                                             HBNB_MYSQL_DB))
+        # any SQLAlchemy URL, e.g. a SQLite file standing in for MySQL
+        url = getenv('HBNB_MYSQL_URL')
+        if not url:
+            url = 'mysql+mysqldb://{}:{}@{}/{}'.format(HBNB_MYSQL_USER,
+                                                       HBNB_MYSQL_PWD,
+                                                       HBNB_MYSQL_HOST,
+                                                       HBNB_MYSQL_DB)
+        self.__engine = create_engine(
+            url, poolclass=MeteredQueuePool,
+            pool_size=int(getenv('HBNB_MYSQL_POOL_SIZE', 5)),
+            max_overflow=int(getenv('HBNB_MYSQL_MAX_OVERFLOW', 10)),
+            pool_timeout=float(getenv('HBNB_MYSQL_POOL_TIMEOUT', 30)),
+            pool_recycle=int(getenv('HBNB_MYSQL_POOL_RECYCLE', 3600)),
+            pool_pre_ping=getenv('HBNB_MYSQL_POOL_PRE_PING') == '1',
+            query_cache_size=int(getenv('HBNB_MYSQL_QUERY_CACHE_SIZE', 500)))
         if HBNB_ENV == "test":
             Base.metadata.drop_all(self.__engine)
+        self.__cache = LRUCache(self.__cache_size, self.__cache_ttl or None)
 
     def all(self, cls=None):
         """query on the current database session"""
         new_dict = {}
+        for obj in self.iter_all(cls):
+            new_dict[obj.__class__.__name__ + '.' + obj.id] = obj
+        return (new_dict)
+
+    def iter_all(self, cls=None):
+        """yields the objects of a class, or of every class, fetching the
+        rows in batches so that they need not all be held at once"""
         for clss in classes:
             if cls is None or cls is classes[clss] or cls is clss:
-                objs = self.__session.query(classes[clss]).all()
-                for obj in objs:
-                    key = obj.__class__.__name__ + '.' + obj.id
-                    new_dict[key] = obj
-        return (new_dict)
+                if classes[clss] in cached_classes and self.__clean():
+                    for obj in self.__cached_all(classes[clss]):
+                        yield obj
+                    continue
+                query = self.__session.query(classes[clss])
+                for obj in query.yield_per(self.__batch_size):
+                    yield obj
+
+    def __clean(self):
+        """tells whether the session has no change to write, so that what
+        the database holds is what it sees"""
+        session = self.__session
+        return not (session.new or session.deleted or session.dirty)
+
+    def __cached_all(self, cls):
+        """returns the objects of a cached class, read through the cache"""
+        rows = self.__cache.get(cls.__name__)
+        if rows is not None:
+            return [self.__restore(cls, values) for values in rows]
+        objs = self.__session.query(cls).all()
+        self.__cache.put(cls.__name__, [self.__snapshot(obj)
+                                        for obj in objs])
+        return objs
+
+    @staticmethod
+    def __snapshot(obj):
+        """returns the column values of obj, which the cache holds"""
+        mapper = sqlalchemy.inspect(obj.__class__)
+        return {attr.key: getattr(obj, attr.key)
+                for attr in mapper.column_attrs}
+
+    def __restore(self, cls, values):
+        """returns the object of the session with the cached values, added
+        to it without querying the database"""
+        obj = self.__session.identity_map.get(identity_key(cls,
+                                                           values["id"]))
+        if obj is not None:
+            return obj
+        obj = cls.__mapper__.class_manager.new_instance()
+        for key, value in values.items():
+            setattr(obj, key, value)
+        make_transient_to_detached(obj)
+        return self.__session.merge(obj, load=False)
+
+    def __invalidate(self, obj):
+        """drops obj from the cache and counts the change to its class"""
+        generations.bump(obj.__class__.__name__)
+        if isinstance(obj, cached_classes):
+            name = obj.__class__.__name__
+            self.__cache.pop(name + '.' + str(obj.id))
+            self.__cache.pop(name)
 
     def new(self, obj):
         """add the object to the current database session"""
         self.__session.add(obj)
+        self.__invalidate(obj)
 
     def save(self):
         """commit all changes of the current database session"""
-        self.__session.commit()
+        session = self.__session
+        changed = list(session.new) + list(session.dirty) + \
+            list(session.deleted)
+        session.commit()
+        # again once committed, in case another thread read the old rows
+        for obj in changed:
+            self.__invalidate(obj)
 
     def delete(self, obj=None):
         """delete from the current database session obj if not None"""
         if obj is not None:
             self.__session.delete(obj)
+            self.__invalidate(obj)
 
     def reload(self):
         """reloads data from the database"""
@@ -71,30 +158,156 @@ class DBStorage:
         Session = scoped_session(sess_factory)
         self.__session = Session
 
+    def migrate(self):
+        """
+        Creates the missing tables, then the indexes declared by the models
+        that the existing tables lack, and returns the names of the indexes
+        created
+        """
+        Base.metadata.create_all(self.__engine)
+        created = []
+        with self.__engine.begin() as connection:
+            inspector = sqlalchemy.inspect(connection)
+            for table in Base.metadata.sorted_tables:
+                existing = {index["name"]
+                            for index in inspector.get_indexes(table.name)}
+                for index in sorted(table.indexes, key=lambda i: i.name):
+                    if index.name not in existing:
+                        index.create(connection)
+                        created.append(index.name)
+        return created
+
     def close(self):
         """call remove() method on the private session attribute"""
         self.__session.remove()
 
     def get(self, cls, id):
         """
-        Retrieves object of a class all objects of that class
+        Retrieves one object by class and id through its primary key
         """
         if id and isinstance(id, str):
-            if cls and (cls in classes.keys() or cls in classes.values()):
-                all_objects = self.all(cls)
-                for key, value in all_objects.items():
-                    if id == value.id and key.split('.')[1] == id:
-                        return value
+            if cls in classes.keys():
+                cls = classes[cls]
+            if cls in classes.values():
+                if cls not in cached_classes or not self.__clean():
+                    return self.__session.get(cls, id)
+                obj = self.__session.identity_map.get(identity_key(cls, id))
+                if obj is not None:
+                    return obj
+                key = cls.__name__ + '.' + id
+                values = self.__cache.get(key)
+                if values is not None:
+                    return self.__restore(cls, values)
+                obj = self.__session.get(cls, id)
+                if obj is not None:
+                    self.__cache.put(key, self.__snapshot(obj))
+                return obj
         return
 
+    def get_many(self, cls, ids):
+        """
+        Retrieves the objects of a class with the given ids by id in one
+        query, leaving out the ids of no object
+        """
+        if cls in classes.keys():
+            cls = classes[cls]
+        if cls not in classes.values():
+            return {}
+        session = self.__session
+        found = {}
+        missing = set()
+        for id in ids:
+            if id and isinstance(id, str):
+                obj = session.identity_map.get(identity_key(cls, id))
+                if obj is not None and obj not in session.deleted:
+                    found[id] = obj
+                else:
+                    missing.add(id)
+        if missing:
+            query = session.query(cls).filter(cls.id.in_(missing))
+            for obj in query:
+                found[obj.id] = obj
+        return found
+
+    def cache_stats(self):
+        """
+        Returns the size of the object cache and its hit, miss and eviction
+        counters
+        """
+        return self.__cache.stats()
+
+    def page(self, cls, limit=None, after=None, fk=None, parent_id=None):
+        """
+        Returns up to limit objects of a class ordered by (created_at, id),
+        starting after the position after, only those whose foreign key fk
+        is parent_id if fk is given; without limit, an iterable fetching
+        them in batches as iter_all does
+        """
+        if cls in classes.keys():
+            cls = classes[cls]
+        if cls not in classes.values():
+            return []
+        query = self.__session.query(cls)
+        if fk is not None:
+            query = query.filter(getattr(cls, fk) == parent_id)
+        if after is not None:
+            created_at, id = after
+            query = query.filter(or_(cls.created_at > created_at,
+                                     and_(cls.created_at == created_at,
+                                          cls.id > id)))
+        query = query.order_by(cls.created_at, cls.id)
+        if limit is None:
+            return query.yield_per(self.__batch_size)
+        return query.limit(limit).all()
+
+    def search(self, states=None, cities=None, amenities=None):
+        """
+        Returns the places of the given states and cities (of every city if
+        neither is given) having all the given amenities, in one query
+        """
+        from models.place import place_amenity
+        query = self.__session.query(Place)
+        if states or cities:
+            state_ids = [i for i in states or () if isinstance(i, str)]
+            city_ids = [i for i in cities or () if isinstance(i, str)]
+            query = query.join(City, Place.city_id == City.id)
+            query = query.filter(or_(City.state_id.in_(state_ids),
+                                     Place.city_id.in_(city_ids)))
+        if amenities:
+            amenity_ids = {i for i in amenities if isinstance(i, str)}
+            if not amenity_ids:
+                return []
+            matched = func.count(distinct(place_amenity.c.amenity_id))
+            having_all = (select(place_amenity.c.place_id)
+                          .where(place_amenity.c.amenity_id.in_(amenity_ids))
+                          .group_by(place_amenity.c.place_id)
+                          .having(matched == len(amenity_ids)))
+            query = query.filter(Place.id.in_(having_all))
+        return query.options(selectinload(Place.amenities)).all()
+
+    def pool_status(self):
+        """
+        Returns the state of the connection pool and how long checkouts
+        waited for a connection
+        """
+        return self.__engine.pool.metrics()
+
     def count(self, cls=None):
         """
-        Returns the occurrence of a class || all classes
+        Returns the occurrence of a class || all classes, counted by the
+        database without loading any row
         """
         occurrence = 0
         if cls:
-            if cls in classes.keys() or cls in classes.values():
-                occurrence = len(self.all(cls))
+            if cls in classes.keys():
+                cls = classes[cls]
+            if cls in classes.values():
+                query = select(func.count()).select_from(cls)
+                occurrence = self.__session.execute(query).scalar()
         if not cls:
-            occurrence = len(self.all())
-        return occurrence
\ No newline at end of file
+            counts = union_all(*(select(func.count().label("occurrence"))
+                                 .select_from(clss)
+                                 for clss in classes.values())).subquery()
+            query = select(func.sum(counts.c.occurrence))
+            occurrence = self.__session.execute(query).scalar() or 0
+        return int(occurrence)
@@ -3,94 +3,649 @@
 Contains the FileStorage class
 """
 
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
 import json
+import mmap
+from os import fsync, getenv, getpid, remove, replace, stat
+import threading
+from types import MappingProxyType
 from models.amenity import Amenity
-from models.base_model import BaseModel
+from models.base_model import BaseModel, dirty
+from models.engine import binary_snapshot, generations, keyset
+from models.engine.search_index import SearchIndex
 from models.city import City
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+# attributes holding the id of a parent object, indexed for the getters
+foreign_keys = ("state_id", "city_id", "place_id", "user_id")
+
+
+def _class_name(cls):
+    """returns the name of a known class given the class or its name"""
+    if cls in classes.keys():
+        return cls
+    if cls in classes.values():
+        return cls.__name__
+    return None
+
+
+@contextmanager
+def _flock(path, exclusive):
+    """holds the advisory lock that processes sharing the JSON file take
+    around reading (shared) or writing (exclusive) it"""
+    if fcntl is None:
+        yield
+        return
+    with open(path, 'a') as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class _RWLock:
+    """lets any number of threads read at once but only one write"""
+
+    def __init__(self):
+        """initializes the lock as free"""
+        self.__cond = threading.Condition()
+        self.__readers = 0
+        self.__writing = False
+
+    @contextmanager
+    def reading(self):
+        """holds the lock shared for the duration of the block"""
+        with self.__cond:
+            while self.__writing:
+                self.__cond.wait()
+            self.__readers += 1
+        try:
+            yield
+        finally:
+            with self.__cond:
+                self.__readers -= 1
+                if not self.__readers:
+                    self.__cond.notify_all()
+
+    @contextmanager
+    def writing(self):
+        """holds the lock exclusively for the duration of the block"""
+        with self.__cond:
+            while self.__writing or self.__readers:
+                self.__cond.wait()
+            self.__writing = True
+        try:
+            yield
+        finally:
+            with self.__cond:
+                self.__writing = False
+                self.__cond.notify_all()
 
 
 class FileStorage:
     """serializes instances to a JSON file & deserializes back to instances"""
 
+    # string - format of the file, "json" or "binary" (see binary_snapshot)
+    __format = getenv("HBNB_FILE_FORMAT", "json")
     # string - path to the JSON file
-    __file_path = "file.json"
+    __file_path = "file.bin" if __format == "binary" else "file.json"
+    # bool - append changes to a journal next to the file instead of
+    # rewriting the whole file on every save
+    __journal = getenv("HBNB_FILE_JOURNAL") == "1"
+    # bool - with the binary format, map the file and only build objects
+    # from their records when they are first asked for; the default, since
+    # decoding every record eagerly is no faster than parsing JSON
+    __lazy_load = getenv("HBNB_FILE_LAZY", "1") == "1"
+    # integer - journal size in bytes past which the file is rewritten
+    __journal_limit = int(getenv("HBNB_FILE_JOURNAL_LIMIT", 1048576))
+    # integer - size in bytes of the journal as last read or written
+    __log_size = 0
+    # tuple - identity of the JSON file and journal as last read or written
+    __loaded = None
     # dictionary - empty but will store all objects by <class name>.id
     __objects = {}
+    # dictionary - the same objects partitioned by <class name>
+    __partitions = {}
+    # dictionary - (<class name>, foreign key) -> parent id -> {key: obj}
+    __children = {}
+    # dictionary - <class name>.id -> {foreign key: parent id} as indexed
+    __parents = {}
+    # dictionary - serialized objects by <class name>.id as last persisted
+    __stored = {}
+    # dictionary - <class name> -> {key: (map, layout, offset)} for the
+    # records of the mapped file not built into objects yet
+    __lazy = {}
+    # dictionary - <class name> -> sorted list of the (created_at, id)
+    # keyset positions of its objects, built on the first page() of it
+    __order = {}
+    # dictionary - <class name>.id -> keyset position as filed in __order
+    __ranks = {}
+    # SearchIndex - places by state, city and amenity ids for search()
+    __search = SearchIndex()
+    # set - <class name>.id of the objects deleted since the last save
+    __deleted = set()
+    # lock - serializes the threads of this process reading or writing
+    # the file; processes coordinate through an flock on <file>.lock
+    __lock = _RWLock()
 
     def all(self, cls=None):
-        """returns the dictionary __objects"""
+        """returns the dictionary __objects, or a read-only view of the
+        objects of one class"""
         if cls is not None:
-            new_dict = {}
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return new_dict
+            name = _class_name(cls)
+            if self.__lazy.get(name):
+                with self.__lock.writing():
+                    self.__hydrate_all(name)
+            return MappingProxyType(self.__partitions.get(name, {}))
+        if any(self.__lazy.values()):
+            with self.__lock.writing():
+                for name in list(self.__lazy):
+                    self.__hydrate_all(name)
         return self.__objects
 
+    def iter_all(self, cls=None):
+        """yields the objects of a class, or of every class"""
+        # a snapshot of the references, objects may be added meanwhile
+        for obj in list(self.all(cls).values()):
+            yield obj
+
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
         if obj is not None:
-            key = obj.__class__.__name__ + "." + obj.id
+            with self.__lock.writing():
+                self.__add(obj)
+            generations.bump(obj.__class__.__name__)
+
+    def __add(self, obj):
+        """files obj under its key, holding the lock"""
+        if obj is not None:
+            name = obj.__class__.__name__
+            key = name + "." + obj.id
             self.__objects[key] = obj
+            self.__partitions.setdefault(name, {})[key] = obj
+            self.__lazy.get(name, {}).pop(key, None)
+            self.__unlink(key)
+            self.__link(key, obj)
+            self.__rank(key, obj)
+            self.__deleted.discard(key)
+            dirty.add(obj)
+
+    def __link(self, key, obj):
+        """files obj under the parent ids it refers to"""
+        name = obj.__class__.__name__
+        parents = {}
+        for fk in foreign_keys:
+            parent_id = getattr(obj, fk, None)
+            if parent_id and isinstance(parent_id, str):
+                index = self.__children.setdefault((name, fk), {})
+                index.setdefault(parent_id, {})[key] = obj
+                parents[fk] = parent_id
+        if parents:
+            self.__parents[key] = parents
+        self.__search.link(key, obj)
+
+    def __unlink(self, key):
+        """removes the object stored under key from the parent indexes"""
+        self.__search.unlink(key)
+        name = key.split('.')[0]
+        for fk, parent_id in self.__parents.pop(key, {}).items():
+            index = self.__children[(name, fk)]
+            index[parent_id].pop(key, None)
+            if not index[parent_id]:
+                del index[parent_id]
+
+    def __rank(self, key, obj):
+        """files obj at its keyset position if its class is ordered"""
+        name = key.split('.')[0]
+        if name in self.__order:
+            self.__unrank(key)
+            position = keyset.sort_key(obj)
+            insort(self.__order[name], position)
+            self.__ranks[key] = position
+
+    def __unrank(self, key):
+        """removes the object stored under key from the keyset order"""
+        position = self.__ranks.pop(key, None)
+        if position is not None:
+            order = self.__order[key.split('.')[0]]
+            i = bisect_left(order, position)
+            if i < len(order) and order[i] == position:
+                del order[i]
 
     def save(self):
-        """serializes __objects to the JSON file (path: __file_path)"""
-        json_objects = {}
-        for key in self.__objects:
-            json_objects[key] = self.__objects[key].to_dict()
-        with open(self.__file_path, 'w') as f:
-            json.dump(json_objects, f)
+        """serializes __objects to the JSON file (path: __file_path), or
+        appends what changed since the last save to the journal"""
+        with self.__lock.writing(), _flock(self.__file_path + ".lock", True):
+            # merge what other processes wrote so it is not overwritten
+            self.__sync()
+            self.__save()
 
-    def reload(self):
-        """deserializes the JSON file to __objects"""
+    def __save(self):
+        """persists the changed objects, holding both locks; they stay
+        changed if writing fails, so that the next save writes them"""
+        changed = {}
+        for obj in list(dirty):
+            key = obj.__class__.__name__ + "." + str(getattr(obj, "id", ""))
+            if self.__objects.get(key) is obj:
+                changed[key] = obj
+                # a foreign key may have been reassigned since new()
+                self.__unlink(key)
+                self.__link(key, obj)
+                self.__rank(key, obj)
+        for name in set(key.split('.')[0] for key in changed):
+            generations.bump(name)
+        if not self.__journal:
+            json_objects = {}
+            for key, obj in self.__objects.items():
+                if key in changed or key not in self.__stored:
+                    json_objects[key] = obj.to_dict()
+                else:
+                    json_objects[key] = self.__stored[key]
+            self.__write(json_objects)
+            self.__saved(changed)
+            return
+        records = []
+        stored = {}
+        for key, obj in changed.items():
+            value = obj.to_dict()
+            if self.__stored.get(key) != value:
+                records.append({"op": "set", "key": key, "value": value})
+                stored[key] = value
+        removed = [key for key in self.__deleted
+                   if key in self.__stored and key not in self.__objects]
+        records.extend({"op": "del", "key": key} for key in removed)
+        if records:
+            with open(self.__file_path + ".log", 'a') as f:
+                f.write("".join(json.dumps(r) + "\n" for r in records))
+                f.flush()
+                fsync(f.fileno())
+                FileStorage.__log_size = f.tell()
+            FileStorage.__loaded = self.__signature()
+        # only once the journal holds them
+        self.__stored.update(stored)
+        for key in removed:
+            del self.__stored[key]
+        self.__saved(changed)
+        if self.__log_size > self.__journal_limit:
+            self.__write(dict(self.__stored))
+
+    def __saved(self, changed):
+        """forgets the changes a save has written"""
+        for obj in changed.values():
+            dirty.discard(obj)
+        self.__deleted.clear()
+
+    def __write(self, json_objects):
+        """rewrites the JSON file with json_objects and drops the journal
+        it now supersedes"""
+        for name, records in self.__lazy.items():
+            for key, (buf, layout, offset) in records.items():
+                if key not in json_objects:
+                    json_objects[key] = binary_snapshot.decode(buf, name,
+                                                               layout, offset)
+        # readers see either the old or the new file, never a partial one
+        tmp_path = "{}.{}.tmp".format(self.__file_path, getpid())
+        try:
+            with open(tmp_path, 'wb' if self.__binary() else 'w') as f:
+                if self.__binary():
+                    binary_snapshot.dump(json_objects, f)
+                else:
+                    json.dump(json_objects, f)
+                f.flush()
+                fsync(f.fileno())
+            replace(tmp_path, self.__file_path)
+        except BaseException:
+            try:
+                remove(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
         try:
-            with open(self.__file_path, 'r') as f:
-                jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
-        except Exception:
+            remove(self.__file_path + ".log")
+        except FileNotFoundError:
             pass
+        FileStorage.__log_size = 0
+        FileStorage.__loaded = self.__signature()
+        self.__stored.clear()
+        if self.__lazy_mode():
+            # records not built yet are read again from the new file
+            self.__lazy.clear()
+            self.__lazy.update(self.__map())
+            for key in self.__objects:
+                self.__lazy.get(key.split('.')[0], {}).pop(key, None)
+            for key, value in json_objects.items():
+                if key in self.__objects:
+                    self.__stored[key] = value
+        else:
+            self.__stored.update(json_objects)
+
+    def __binary(self):
+        """tells whether the file uses the binary snapshot format"""
+        return self.__format == "binary"
+
+    def __lazy_mode(self):
+        """tells whether records are only built into objects on demand"""
+        return self.__lazy_load and self.__binary()
+
+    def __map(self):
+        """maps the binary file in memory and returns the index of its
+        records by <class name> then key"""
+        with open(self.__file_path, 'rb') as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        index = {}
+        for name, layout, id, offset, length in binary_snapshot.scan(buf):
+            records = index.setdefault(name, {})
+            records[name + "." + id] = (buf, layout, offset)
+        return index
+
+    def __hydrate(self, key):
+        """builds the object of the record under key if it was not built
+        yet and returns it, holding the lock"""
+        name = key.split('.')[0]
+        entry = self.__lazy.get(name, {}).pop(key, None)
+        if entry is None:
+            return self.__objects.get(key)
+        buf, layout, offset = entry
+        value = binary_snapshot.decode(buf, name, layout, offset)
+        obj = classes[name].from_storage_dict(value)
+        self.__add(obj)
+        dirty.discard(obj)
+        self.__stored[key] = value
+        return obj
+
+    def __hydrate_all(self, name):
+        """builds the objects of every record of a class, holding the lock"""
+        for key in list(self.__lazy.get(name, {})):
+            self.__hydrate(key)
+
+    def __signature(self):
+        """returns what identifies the current contents of the JSON file
+        and of its journal"""
+        signature = []
+        for path in (self.__file_path, self.__file_path + ".log"):
+            try:
+                st = stat(path)
+                signature.append((st.st_ino, st.st_size, st.st_mtime_ns))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def __read(self):
+        """returns the objects of the JSON file with the journal applied,
+        deleted ones mapped to None, and in lazy mode the index of the
+        records of the file, which are then left out of the objects"""
+        index = None
+        try:
+            if self.__lazy_mode():
+                jo = {}
+                index = self.__map()
+            elif self.__binary():
+                with open(self.__file_path, 'rb') as f:
+                    jo = binary_snapshot.load(f.read())
+            else:
+                with open(self.__file_path, 'r') as f:
+                    jo = json.load(f)
+        except FileNotFoundError:
+            jo = {}
+            if self.__lazy_mode():
+                index = {}
+        FileStorage.__log_size = self.__replay(jo, 0)
+        return jo, index
+
+    def __replay(self, jo, offset):
+        """applies the journal from offset on to jo and returns the size of
+        the journal"""
+        try:
+            with open(self.__file_path + ".log", 'rb') as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return 0
+        for line in data.decode('utf-8').splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # torn record from an append that did not complete
+                continue
+            if record["op"] == "set":
+                jo[record["key"]] = record["value"]
+            else:
+                jo[record["key"]] = None
+        return offset + len(data)
+
+    def reload(self):
+        """deserializes the JSON file, then the journal, to __objects"""
+        with self.__lock.writing(), _flock(self.__file_path + ".lock", False):
+            self.__load()
+
+    def __load(self):
+        """reads every object of the JSON file, holding both locks"""
+        signature = self.__signature()
+        jo, index = self.__read()
+        self.__stored.clear()
+        if index is not None:
+            self.__lazy.clear()
+            self.__lazy.update(index)
+            for key in list(self.__objects):
+                self.__hydrate(key)
+        for key, value in jo.items():
+            if value is None:
+                self.__lazy.get(key.split('.')[0], {}).pop(key, None)
+            else:
+                self.__stored[key] = value
+                obj = classes[value["__class__"]].from_storage_dict(value)
+                self.__add(obj)
+                dirty.discard(obj)
+        FileStorage.__loaded = signature
+
+    def __refresh(self, changes):
+        """applies changes read from the JSON file or the journal, leaving
+        the objects whose stored form did not change untouched"""
+        for key, value in changes.items():
+            obj = self.__objects.get(key)
+            if obj in dirty or key in self.__deleted:
+                # unsaved changes made in this process win
+                continue
+            if value is not None and self.__stored.get(key) == value:
+                continue
+            generations.bump(key.split('.')[0])
+            if value is None:
+                if key in self.__objects:
+                    self.__remove(self.__objects[key])
+                self.__stored.pop(key, None)
+                self.__lazy.get(key.split('.')[0], {}).pop(key, None)
+            else:
+                obj = classes[value["__class__"]].from_storage_dict(value)
+                self.__add(obj)
+                dirty.discard(obj)
+                self.__stored[key] = value
 
     def delete(self, obj=None):
         """delete obj from __objects if it’s inside"""
         if obj is not None:
-            key = obj.__class__.__name__ + '.' + obj.id
+            with self.__lock.writing():
+                self.__remove(obj)
+            generations.bump(obj.__class__.__name__)
+
+    def __remove(self, obj):
+        """drops obj from under its key, holding the lock"""
+        if obj is not None:
+            name = obj.__class__.__name__
+            key = name + '.' + obj.id
             if key in self.__objects:
                 del self.__objects[key]
+                self.__partitions.get(name, {}).pop(key, None)
+                self.__unlink(key)
+                self.__unrank(key)
+                self.__deleted.add(key)
 
     def close(self):
-        """call reload() method for deserializing the JSON file to objects"""
-        self.reload()
+        """picks up what other processes wrote to the JSON file since it was
+        last read, reading only the new part of the journal when it can"""
+        with self.__lock.reading():
+            if self.__signature() == self.__loaded:
+                return
+        with self.__lock.writing(), _flock(self.__file_path + ".lock", False):
+            self.__sync()
+
+    def __sync(self):
+        """applies what changed on disk since the last read or write,
+        holding both locks"""
+        signature = self.__signature()
+        loaded = self.__loaded
+        if signature == loaded:
+            return
+        if (loaded and signature[0] == loaded[0] and
+                signature[1] and loaded[1] and
+                signature[1][0] == loaded[1][0] and
+                signature[1][1] >= self.__log_size):
+            changes = {}
+            FileStorage.__log_size = self.__replay(changes, self.__log_size)
+        else:
+            changes, index = self.__read()
+            for key in self.__stored:
+                if key in changes:
+                    continue
+                name = key.split('.')[0]
+                entry = index.get(name, {}).pop(key, None) if index else None
+                if entry is None:
+                    changes[key] = None
+                else:
+                    # an object already built is compared with its record
+                    changes[key] = binary_snapshot.decode(entry[0], name,
+                                                          entry[1], entry[2])
+            if index is not None:
+                for key in self.__objects:
+                    index.get(key.split('.')[0], {}).pop(key, None)
+                self.__lazy.clear()
+                self.__lazy.update(index)
+        self.__refresh(changes)
+        FileStorage.__loaded = signature
 
     def get(self, cls, id):
         """
-        Retrieves object of a class all objects of that class
+        Retrieves one object by class and id, or None if there is none
         """
         if id and isinstance(id, str):
-            if cls and (cls in classes.keys() or cls in classes.values()):
-                all_objects = self.all(cls)
-                for key, value in all_objects.items():
-                    if id == value.id and key.split('.')[1] == id:
-                        return value
+            name = _class_name(cls)
+            if name:
+                key = name + "." + id
+                obj = self.__objects.get(key)
+                if obj is None and key in self.__lazy.get(name, {}):
+                    with self.__lock.writing():
+                        obj = self.__hydrate(key)
+                return obj
         return
 
+    def get_many(self, cls, ids):
+        """
+        Retrieves the objects of a class with the given ids by id, leaving
+        out the ids of no object
+        """
+        name = _class_name(cls)
+        if name is None:
+            return {}
+        found = {}
+        lazy = []
+        for id in ids:
+            if id and isinstance(id, str):
+                key = name + "." + id
+                obj = self.__objects.get(key)
+                if obj is not None:
+                    found[id] = obj
+                elif key in self.__lazy.get(name, {}):
+                    lazy.append((id, key))
+        if lazy:
+            with self.__lock.writing():
+                for id, key in lazy:
+                    obj = self.__hydrate(key)
+                    if obj is not None:
+                        found[id] = obj
+        return found
+
+    def children(self, cls, fk, parent_id):
+        """
+        Returns the objects of a class whose foreign key fk is parent_id
+        """
+        name = _class_name(cls)
+        if self.__lazy.get(name):
+            # the foreign keys of records not built yet are not indexed
+            with self.__lock.writing():
+                self.__hydrate_all(name)
+        index = self.__children.get((name, fk), {})
+        return list(index.get(parent_id, {}).values())
+
+    def page(self, cls, limit=None, after=None, fk=None, parent_id=None):
+        """
+        Returns up to limit objects of a class ordered by (created_at, id),
+        starting after the position after, only those whose foreign key fk
+        is parent_id if fk is given
+        """
+        name = _class_name(cls)
+        if name is None:
+            return []
+        if fk is not None:
+            return keyset.page(self.children(name, fk, parent_id),
+                               limit, after)
+        if self.__lazy.get(name) or name not in self.__order:
+            with self.__lock.writing():
+                self.__hydrate_all(name)
+                if name not in self.__order:
+                    order = []
+                    for key, obj in self.__partitions.get(name, {}).items():
+                        self.__ranks[key] = keyset.sort_key(obj)
+                        order.append(self.__ranks[key])
+                    order.sort()
+                    self.__order[name] = order
+        with self.__lock.reading():
+            order = self.__order[name]
+            start = 0 if after is None else bisect_right(order, after)
+            end = len(order) if limit is None else start + limit
+            partition = self.__partitions[name] if order else {}
+            return [partition[name + "." + id]
+                    for created_at, id in order[start:end]]
+
+    def search(self, states=None, cities=None, amenities=None):
+        """
+        Returns the places of the given states and cities (of every city if
+        neither is given) having all the given amenities
+        """
+        if self.__lazy.get("City") or self.__lazy.get("Place"):
+            # the records not built yet are not indexed
+            with self.__lock.writing():
+                self.__hydrate_all("City")
+                self.__hydrate_all("Place")
+        with self.__lock.reading():
+            ids = self.__search.search(states, cities, amenities)
+            if ids is None:
+                return list(self.__partitions.get("Place", {}).values())
+            return [self.__objects["Place." + id] for id in ids]
+
     def count(self, cls=None):
         """
         Returns the occurrence of a class  all classes
         """
         occurrence = 0
         if cls:
-            if cls in classes.keys() or cls in classes.values():
-                occurrence = len(self.all(cls))
+            name = _class_name(cls)
+            if name:
+                occurrence = (len(self.__partitions.get(name, {})) +
+                              len(self.__lazy.get(name, {})))
             else:
                 return occurrence
         if not cls:
-            occurrence = len(self.all())
-        return occurrence
\ No newline at end of file
+            occurrence = len(self.__objects)
+            for records in self.__lazy.values():
+                occurrence += len(records)
+        return occurrence
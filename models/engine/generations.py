@@ -0,0 +1,34 @@
+#!/usr/bin/python3
+"""
+Counts the changes made to the objects of each class through the storage
+engines of this process, so that what was computed from them can tell it
+is out of date
+"""
+
+from datetime import datetime
+import threading
+
+_lock = threading.Lock()
+# dictionary - class name -> number of changes made to its objects
+_generations = {}
+# dictionary - class name -> time of the last change to its objects
+_changed = {}
+# time before which no change was counted
+started = datetime.utcnow()
+
+
+def bump(name):
+    """records a change to the objects of the class name"""
+    with _lock:
+        _generations[name] = _generations.get(name, 0) + 1
+        _changed[name] = datetime.utcnow()
+
+
+def generation(names):
+    """returns the generations of the classes names and the time of the
+    last change to any of them"""
+    with _lock:
+        counts = tuple(_generations.get(name, 0) for name in names)
+        last = max((_changed[name] for name in names if name in _changed),
+                   default=started)
+    return counts, last
@@ -0,0 +1,30 @@
+#!/usr/bin/python3
+"""
+Contains the keyset ordering shared by the storage engines and the API
+
+Objects are ordered by (created_at, id), so a page of them is given by the
+position after which it starts and its size, wherever the rows are.
+"""
+
+from bisect import bisect_right
+from datetime import datetime
+
+
+def sort_key(obj):
+    """returns the (created_at, id) position of obj in the keyset order"""
+    created_at = getattr(obj, "created_at", None)
+    if not isinstance(created_at, datetime):
+        created_at = datetime.min
+    return created_at, str(getattr(obj, "id", ""))
+
+
+def page(objects, limit=None, after=None):
+    """returns up to limit of objects in the keyset order, starting after
+    the position after (from the first one if None)"""
+    objects = sorted(objects, key=sort_key)
+    start = 0
+    if after is not None:
+        start = bisect_right([sort_key(obj) for obj in objects], after)
+    if limit is None:
+        return objects[start:]
+    return objects[start:start + limit]
@@ -0,0 +1,95 @@
+#!/usr/bin/python3
+"""
+Contains the SearchIndex class answering the places searches of FileStorage
+"""
+
+
+def searched_ids(values):
+    """returns the ids among the values a client searched for, or a place
+    lists, leaving out what is not a string"""
+    return [value for value in values or () if isinstance(value, str)]
+
+
+class SearchIndex:
+    """inverted index of the places by state, city and amenity ids, kept up
+    to date by FileStorage as it files and drops objects"""
+
+    def __init__(self):
+        """initializes an empty index"""
+        # dictionary - state id -> set of the ids of its cities
+        self.__cities = {}
+        # dictionary - city id -> set of the ids of its places
+        self.__places = {}
+        # dictionary - amenity id -> set of the ids of the places having it
+        self.__amenities = {}
+        # dictionary - <class name>.id -> what the object was indexed under
+        self.__links = {}
+
+    def link(self, key, obj):
+        """indexes obj, a city or a place, under the ids it refers to"""
+        name, id = key.split('.', 1)
+        if name == "City":
+            state_id = getattr(obj, "state_id", None)
+            if state_id and isinstance(state_id, str):
+                self.__cities.setdefault(state_id, set()).add(id)
+                self.__links[key] = state_id
+        elif name == "Place":
+            city_id = getattr(obj, "city_id", None)
+            if not (city_id and isinstance(city_id, str)):
+                city_id = None
+            amenity_ids = getattr(obj, "amenity_ids", None) or []
+            amenity_ids = frozenset(a for a in amenity_ids
+                                    if a and isinstance(a, str))
+            if city_id:
+                self.__places.setdefault(city_id, set()).add(id)
+            for amenity_id in amenity_ids:
+                self.__amenities.setdefault(amenity_id, set()).add(id)
+            self.__links[key] = (city_id, amenity_ids)
+
+    def unlink(self, key):
+        """removes the object stored under key from the index"""
+        links = self.__links.pop(key, None)
+        if links is None:
+            return
+        name, id = key.split('.', 1)
+        if name == "City":
+            self.__discard(self.__cities, links, id)
+        else:
+            city_id, amenity_ids = links
+            if city_id:
+                self.__discard(self.__places, city_id, id)
+            for amenity_id in amenity_ids:
+                self.__discard(self.__amenities, amenity_id, id)
+
+    @staticmethod
+    def __discard(index, parent_id, id):
+        """removes id from the set of parent_id in index"""
+        ids = index.get(parent_id)
+        if ids is not None:
+            ids.discard(id)
+            if not ids:
+                del index[parent_id]
+
+    def search(self, states=None, cities=None, amenities=None):
+        """returns the ids of the places of the given states and cities (of
+        every city if neither is given) having all the given amenities, or
+        None for every place when no criterion is given"""
+        result = None
+        if states or cities:
+            city_ids = set(searched_ids(cities))
+            for state_id in searched_ids(states):
+                city_ids.update(self.__cities.get(state_id, ()))
+            result = set()
+            for city_id in city_ids:
+                result.update(self.__places.get(city_id, ()))
+        if amenities:
+            # intersect starting from the smallest set
+            sets = sorted((self.__amenities.get(a, set())
+                           for a in set(searched_ids(amenities))), key=len)
+            if not sets:
+                return set()
+            if result is None:
+                result = set(sets[0])
+            for ids in sets:
+                result &= ids
+        return result
@@ -0,0 +1,345 @@
+#!/usr/bin/python3
+"""
+Contains the class SQLiteStorage
+
+Every class has its table holding the id, the timestamps and the foreign
+keys of its objects as indexed columns, and their to_dict() as JSON. The
+amenities of the places are also kept in place_amenity for search().
+Like the session of DBStorage, the objects of a thread are held in an
+identity map and their changes are only written by save() (or before a
+query, uncommitted) until close() drops them.
+"""
+
+import json
+from os import getenv
+import sqlite3
+import threading
+from models.amenity import Amenity
+from models.base_model import BaseModel, dirty
+from models.city import City
+from models.engine import generations
+from models.engine.search_index import searched_ids
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+
+classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
+           "Place": Place, "Review": Review, "State": State, "User": User}
+# columns of the foreign keys of each class, indexed
+columns = {"Amenity": (), "BaseModel": (), "City": ("state_id",),
+           "Place": ("city_id", "user_id"), "Review": ("place_id", "user_id"),
+           "State": (), "User": ()}
+
+
+def _schema():
+    """returns the statements creating the tables and their indexes"""
+    statements = ["PRAGMA journal_mode=WAL"]
+    for name, fks in columns.items():
+        statements.append(
+            'CREATE TABLE IF NOT EXISTS "{}" (id TEXT PRIMARY KEY, '
+            'created_at TEXT, updated_at TEXT, {}data TEXT NOT NULL)'
+            .format(name, "".join(fk + " TEXT, " for fk in fks)))
+        statements.append(
+            'CREATE INDEX IF NOT EXISTS "{0}_created_at_id" '
+            'ON "{0}" (created_at, id)'.format(name))
+        for fk in fks:
+            statements.append(
+                'CREATE INDEX IF NOT EXISTS "{0}_{1}" ON "{0}" ({1})'
+                .format(name, fk))
+    statements.append(
+        'CREATE TABLE IF NOT EXISTS place_amenity (place_id TEXT NOT NULL, '
+        'amenity_id TEXT NOT NULL, PRIMARY KEY (place_id, amenity_id)) '
+        'WITHOUT ROWID')
+    statements.append(
+        'CREATE INDEX IF NOT EXISTS place_amenity_amenity_id '
+        'ON place_amenity (amenity_id)')
+    return ";\n".join(statements) + ";"
+
+
+def _upsert(name):
+    """returns the statement writing an object of the class name"""
+    names = ("id", "created_at", "updated_at") + columns[name] + ("data",)
+    return ('INSERT INTO "{}" ({}) VALUES ({}) ON CONFLICT (id) DO UPDATE '
+            'SET {}'.format(name, ", ".join(names),
+                            ", ".join("?" * len(names)),
+                            ", ".join("{0} = excluded.{0}".format(column)
+                                      for column in names[1:])))
+
+
+def _marks(values):
+    """returns the placeholders of an IN list of values"""
+    return ", ".join("?" * len(values))
+
+
+upserts = {name: _upsert(name) for name in columns}
+
+
+class SQLiteStorage:
+    """stores the objects in a SQLite database"""
+
+    # string - path to the database file
+    __file_path = getenv("HBNB_SQLITE_PATH", "hbnb.db")
+    # float - seconds a write waits for the writer of another process
+    __timeout = float(getenv("HBNB_SQLITE_TIMEOUT", 30))
+
+    def __init__(self):
+        """Instantiate a SQLiteStorage object"""
+        self.__local = threading.local()
+
+    def __session(self):
+        """returns the connection and the objects of the calling thread"""
+        local = self.__local
+        if getattr(local, "conn", None) is None:
+            local.conn = sqlite3.connect(self.__file_path,
+                                         timeout=self.__timeout,
+                                         cached_statements=256)
+            # durable once the WAL is checkpointed, as WAL mode intends
+            local.conn.execute("PRAGMA synchronous=NORMAL")
+            # dictionary - <class name>.id -> object loaded or added
+            local.identity = {}
+            # dictionary - <class name>.id -> object added and not written
+            local.pending = {}
+            # dictionary - <class name>.id -> object deleted and not written
+            local.deleted = {}
+            # set - names of the classes written and not committed
+            local.written = set()
+        return local
+
+    def __object(self, name, id, data):
+        """returns the object of a row, the one already loaded if any"""
+        identity = self.__session().identity
+        key = name + "." + id
+        obj = identity.get(key)
+        if obj is None:
+            obj = classes[name].from_storage_dict(json.loads(data))
+            dirty.discard(obj)
+            identity[key] = obj
+        return obj
+
+    def __query(self, name, sql, params=()):
+        """yields the objects of the rows (id, data) of a query"""
+        for id, data in self.__session().conn.execute(sql, params):
+            yield self.__object(name, id, data)
+
+    def __flush(self):
+        """writes the changes of the thread in the transaction that save()
+        commits, so that queries see them"""
+        session = self.__session()
+        changed = dict(session.pending)
+        for obj in list(dirty):
+            key = obj.__class__.__name__ + "." + str(getattr(obj, "id", ""))
+            if session.identity.get(key) is obj:
+                changed[key] = obj
+        conn = session.conn
+        for key in session.deleted:
+            name, id = key.split(".", 1)
+            conn.execute('DELETE FROM "{}" WHERE id = ?'.format(name), (id,))
+            if name == "Place":
+                conn.execute("DELETE FROM place_amenity WHERE place_id = ?",
+                             (id,))
+        for key, obj in changed.items():
+            name = key.split(".")[0]
+            value = obj.to_dict(save_to_dict=True)
+            row = [obj.id, value.get("created_at"), value.get("updated_at")]
+            for fk in columns[name]:
+                parent_id = value.get(fk)
+                row.append(parent_id if isinstance(parent_id, str) else None)
+            row.append(json.dumps(value))
+            conn.execute(upserts[name], row)
+            if name == "Place":
+                conn.execute("DELETE FROM place_amenity WHERE place_id = ?",
+                             (obj.id,))
+                conn.executemany("INSERT OR IGNORE INTO place_amenity "
+                                 "VALUES (?, ?)",
+                                 [(obj.id, amenity_id) for amenity_id
+                                  in searched_ids(value.get("amenity_ids"))])
+            dirty.discard(obj)
+        session.written.update(key.split(".")[0] for key in changed)
+        session.written.update(key.split(".")[0] for key in session.deleted)
+        session.pending.clear()
+        session.deleted.clear()
+
+    def all(self, cls=None):
+        """returns the objects of a class, or of every class, by
+        <class name>.id"""
+        new_dict = {}
+        for obj in self.iter_all(cls):
+            new_dict[obj.__class__.__name__ + "." + obj.id] = obj
+        return new_dict
+
+    def iter_all(self, cls=None):
+        """yields the objects of a class, or of every class, as the rows are
+        read"""
+        self.__flush()
+        for name in classes:
+            if cls is None or cls is classes[name] or cls == name:
+                for obj in self.__query(name, 'SELECT id, data FROM "{}"'
+                                        .format(name)):
+                    yield obj
+
+    def new(self, obj):
+        """adds obj to the objects of the thread"""
+        if obj is not None:
+            session = self.__session()
+            key = obj.__class__.__name__ + "." + obj.id
+            session.identity[key] = obj
+            session.pending[key] = obj
+            session.deleted.pop(key, None)
+            generations.bump(obj.__class__.__name__)
+
+    def save(self):
+        """commits the changes of the thread to the database"""
+        self.__flush()
+        session = self.__session()
+        session.conn.commit()
+        # other threads may have read the old rows since new() or delete()
+        for name in session.written:
+            generations.bump(name)
+        session.written.clear()
+
+    def delete(self, obj=None):
+        """deletes obj from the objects of the thread"""
+        if obj is not None:
+            session = self.__session()
+            key = obj.__class__.__name__ + "." + obj.id
+            session.identity.pop(key, None)
+            session.pending.pop(key, None)
+            session.deleted[key] = obj
+            generations.bump(obj.__class__.__name__)
+
+    def reload(self):
+        """creates the tables and indexes missing from the database"""
+        session = self.__session()
+        session.conn.executescript(_schema())
+        self.close()
+
+    def close(self):
+        """drops the uncommitted changes and the objects of the thread"""
+        session = self.__session()
+        session.conn.rollback()
+        session.identity.clear()
+        session.pending.clear()
+        session.deleted.clear()
+        session.written.clear()
+
+    def get(self, cls, id):
+        """
+        Retrieves one object by class and id, or None if there is none
+        """
+        if id and isinstance(id, str):
+            if cls in classes.values():
+                cls = cls.__name__
+            if cls in classes:
+                session = self.__session()
+                key = cls + "." + id
+                if key in session.identity:
+                    return session.identity[key]
+                if key in session.deleted:
+                    return None
+                for obj in self.__query(cls, 'SELECT id, data FROM "{}" '
+                                        'WHERE id = ?'.format(cls), (id,)):
+                    return obj
+        return
+
+    def get_many(self, cls, ids):
+        """
+        Retrieves the objects of a class with the given ids by id in one
+        query, leaving out the ids of no object
+        """
+        if cls in classes.values():
+            cls = cls.__name__
+        if cls not in classes:
+            return {}
+        session = self.__session()
+        found = {}
+        missing = set()
+        for id in ids:
+            if id and isinstance(id, str):
+                key = cls + "." + id
+                if key in session.identity:
+                    found[id] = session.identity[key]
+                elif key not in session.deleted:
+                    missing.add(id)
+        if missing:
+            missing = sorted(missing)
+            for obj in self.__query(cls, 'SELECT id, data FROM "{}" WHERE '
+                                    'id IN ({})'.format(cls, _marks(missing)),
+                                    missing):
+                found[obj.id] = obj
+        return found
+
+    def children(self, cls, fk, parent_id):
+        """
+        Returns the objects of a class whose foreign key fk is parent_id
+        """
+        return self.page(cls, None, None, fk, parent_id)
+
+    def page(self, cls, limit=None, after=None, fk=None, parent_id=None):
+        """
+        Returns up to limit objects of a class ordered by (created_at, id),
+        starting after the position after, only those whose foreign key fk
+        is parent_id if fk is given
+        """
+        if cls in classes.values():
+            cls = cls.__name__
+        if cls not in classes or (fk is not None and
+                                  fk not in columns[cls]):
+            return []
+        self.__flush()
+        where = []
+        params = []
+        if fk is not None:
+            where.append("{} = ?".format(fk))
+            params.append(parent_id)
+        if after is not None:
+            where.append("(created_at, id) > (?, ?)")
+            params.extend((after[0].isoformat(timespec="microseconds"),
+                           after[1]))
+        params.append(-1 if limit is None else limit)
+        sql = 'SELECT id, data FROM "{}"{} ORDER BY created_at, id LIMIT ?'\
+            .format(cls, " WHERE " + " AND ".join(where) if where else "")
+        return list(self.__query(cls, sql, params))
+
+    def search(self, states=None, cities=None, amenities=None):
+        """
+        Returns the places of the given states and cities (of every city if
+        neither is given) having all the given amenities, in one query
+        """
+        self.__flush()
+        where = []
+        params = []
+        if states or cities:
+            state_ids = searched_ids(states)
+            city_ids = searched_ids(cities)
+            where.append('(city_id IN ({}) OR city_id IN (SELECT id FROM '
+                         '"City" WHERE state_id IN ({})))'
+                         .format(_marks(city_ids), _marks(state_ids)))
+            params.extend(city_ids + state_ids)
+        if amenities:
+            amenity_ids = sorted(set(searched_ids(amenities)))
+            if not amenity_ids:
+                return []
+            where.append("id IN (SELECT place_id FROM place_amenity WHERE "
+                         "amenity_id IN ({}) GROUP BY place_id HAVING "
+                         "COUNT(*) = ?)".format(_marks(amenity_ids)))
+            params.extend(amenity_ids + [len(amenity_ids)])
+        sql = 'SELECT id, data FROM "Place"'
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        return list(self.__query("Place", sql, params))
+
+    def count(self, cls=None):
+        """
+        Returns the occurrence of a class || all classes, counted by the
+        database
+        """
+        if cls in classes.values():
+            cls = cls.__name__
+        if cls and cls not in classes:
+            return 0
+        self.__flush()
+        names = [cls] if cls else list(classes)
+        sql = " + ".join('(SELECT COUNT(*) FROM "{}")'.format(name)
+                         for name in names)
+        return self.__session().conn.execute("SELECT " + sql).fetchone()[0]
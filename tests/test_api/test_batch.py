@@ -0,0 +1,87 @@
+#!/usr/bin/python3
+"""
+Contains the TestBatch class
+"""
+
+import unittest
+from unittest import mock
+from api.v1.app import app
+from api.v1.views import batch
+from models import storage
+from models.city import City
+from models.state import State
+from models.user import User
+
+
+class TestBatch(unittest.TestCase):
+    """Test the objects POST /api/v1/batch/get answers with"""
+
+    def setUp(self):
+        """Store a state with a city, and a user"""
+        self.state = State(name="Casablanca-Settat")
+        self.city = City(name="Settat", state_id=self.state.id)
+        self.user = User(email="batch@hbnb.io", password="pwd")
+        self.objects = [self.state, self.city, self.user]
+        for obj in self.objects:
+            storage.new(obj)
+        storage.save()
+        storage.close()
+        self.client = app.test_client()
+
+    def tearDown(self):
+        """Delete the objects, the city first"""
+        for obj in (self.city, self.state, self.user):
+            obj = storage.get(type(obj), obj.id)
+            if obj is not None:
+                storage.delete(obj)
+                storage.save()
+        storage.close()
+
+    def batch(self, body):
+        """Return the response to a batch get of body"""
+        return self.client.post("/api/v1/batch/get", json=body)
+
+    def test_get(self):
+        """Test that the objects are given by class then id, leaving out
+        the ids of no object"""
+        response = self.batch({"State": [self.state.id, "missing"],
+                               "City": [self.city.id],
+                               "User": [self.user.id]})
+        self.assertEqual(response.status_code, 200)
+        objects = response.get_json()
+        self.assertEqual(sorted(objects), ["City", "State", "User"])
+        self.assertEqual(list(objects["State"]), [self.state.id])
+        self.assertEqual(objects["State"][self.state.id]["name"],
+                         "Casablanca-Settat")
+        self.assertEqual(objects["City"][self.city.id]["state_id"],
+                         self.state.id)
+        self.assertNotIn("password", objects["User"][self.user.id])
+        response = self.batch({"State": []})
+        self.assertEqual(response.get_json(), {"State": {}})
+
+    def test_invalid(self):
+        """Test that an invalid body is a bad request naming the error"""
+        bad = (([self.state.id], b"Not a JSON"),
+               ({"Planet": [self.state.id]}, b"Unknown class Planet"),
+               ({"State": self.state.id}, b"Not a list of ids"),
+               ({"State": {self.state.id: 1}}, b"Not a list of ids"))
+        for body, message in bad:
+            with self.subTest(body=body):
+                response = self.batch(body)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(message, response.get_data())
+
+    def test_limit(self):
+        """Test that more ids than HBNB_API_BATCH_LIMIT over all classes
+        are a bad request"""
+        body = {"State": [self.state.id], "City": [self.city.id]}
+        with mock.patch.object(batch, "max_ids", 1):
+            response = self.batch(body)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(b"Too many ids", response.get_data())
+        with mock.patch.object(batch, "max_ids", 2):
+            self.assertEqual(self.batch(body).status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+#!/usr/bin/python3
+"""
+Contains the TestBulk class
+"""
+
+import unittest
+from unittest import mock
+import uuid
+from api.v1.app import app
+from models import storage
+from models.city import City
+from models.state import State
+
+
+class TestBulk(unittest.TestCase):
+    """Test the operations of POST /api/v1/bulk"""
+
+    def setUp(self):
+        """Store a state with a city"""
+        self.state = State(name="Fes-Meknes")
+        self.city = City(name="Fes", state_id=self.state.id)
+        storage.new(self.state)
+        storage.new(self.city)
+        storage.save()
+        storage.close()
+        self.client = app.test_client()
+        self.ids = {"State": [self.state.id], "City": [self.city.id]}
+
+    def tearDown(self):
+        """Delete the cities then the states the tests stored"""
+        for cls in (City, State):
+            for obj in storage.get_many(cls, self.ids[cls.__name__]).values():
+                storage.delete(obj)
+            storage.save()
+        storage.close()
+
+    def bulk(self, ops):
+        """Return the response to the operations"""
+        response = self.client.post("/api/v1/bulk", json=ops)
+        storage.close()
+        return response
+
+    def new_id(self, name):
+        """Return a new id, deleted with the objects of the class name"""
+        id = str(uuid.uuid4())
+        self.ids[name].append(id)
+        return id
+
+    def test_create_refers_to_earlier(self):
+        """Test that a create may refer to the id of an earlier one"""
+        state_id = self.new_id("State")
+        city_id = self.new_id("City")
+        response = self.bulk([
+            {"op": "create", "class": "State",
+             "data": {"id": state_id, "name": "Oriental"}},
+            {"op": "create", "class": "City",
+             "data": {"id": city_id, "state_id": state_id,
+                      "name": "Oujda"}}])
+        self.assertEqual(response.status_code, 200)
+        results = response.get_json()
+        self.assertEqual([result["id"] for result in results],
+                         [state_id, city_id])
+        city = storage.get(City, city_id)
+        self.assertIsNotNone(city)
+        self.assertEqual(city.state_id, state_id)
+
+    def test_create_under_deleted(self):
+        """Test that a create under a parent deleted before is rejected"""
+        state_id = self.new_id("State")
+        self.assertEqual(self.bulk([
+            {"op": "create", "class": "State",
+             "data": {"id": state_id, "name": "Draa"}}]).status_code, 200)
+        response = self.bulk([
+            {"op": "delete", "class": "State", "id": state_id},
+            {"op": "create", "class": "City",
+             "data": {"state_id": state_id, "name": "Ouarzazate"}}])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(b"Operation 1: State not found", response.get_data())
+        self.assertIsNotNone(storage.get(State, state_id))
+
+    def test_update_ignored_keys(self):
+        """Test that an update leaves the id, dates and parents alone"""
+        created_at = self.city.created_at
+        response = self.bulk([
+            {"op": "update", "class": "City", "id": self.city.id,
+             "data": {"id": "other", "created_at": "2000-01-01T00:00:00",
+                      "state_id": "other", "name": "Meknes"}}])
+        self.assertEqual(response.status_code, 200)
+        city = storage.get(City, self.city.id)
+        self.assertEqual(city.name, "Meknes")
+        self.assertEqual(city.state_id, self.state.id)
+        self.assertEqual(city.created_at, created_at)
+        self.assertIsNone(storage.get(City, "other"))
+
+    def test_all_or_nothing(self):
+        """Test that one invalid operation rejects them all, naming it"""
+        state_id = self.new_id("State")
+        bad = [{"op": "rename", "class": "City", "id": self.city.id},
+               {"op": "update", "class": "City", "id": "missing"},
+               {"op": "create", "class": ["City"], "data": {}},
+               {"op": "create", "class": {"City": 1}, "data": {}},
+               {"op": "create", "class": "City", "data": {"name": "Ifrane"}},
+               {"op": "create", "class": "City",
+                "data": {"state_id": self.state.id, "name": "Ifrane",
+                         "created_at": "garbage"}},
+               {"op": "update", "class": "State", "id": self.state.id,
+                "data": {"cities": "Fes"}},
+               "not an operation"]
+        for op in bad:
+            with self.subTest(op=op):
+                response = self.bulk([
+                    {"op": "create", "class": "State",
+                     "data": {"id": state_id, "name": "Souss"}},
+                    {"op": "update", "class": "State", "id": self.state.id,
+                     "data": {"name": "Souss"}},
+                    op])
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(b"Operation 2: ", response.get_data())
+                self.assertIsNone(storage.get(State, state_id))
+                self.assertEqual(storage.get(State, self.state.id).name,
+                                 "Fes-Meknes")
+
+    def test_one_save(self):
+        """Test that the operations are written with one save"""
+        save = storage.save
+        with mock.patch.object(storage, "save", side_effect=save) as spy:
+            response = self.bulk([
+                {"op": "create", "class": "State",
+                 "data": {"id": self.new_id("State"), "name": "Rabat"}},
+                {"op": "update", "class": "State", "id": self.state.id,
+                 "data": {"name": "Rabat-Sale"}},
+                {"op": "delete", "class": "City", "id": self.city.id}])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()[2], {})
+        self.assertEqual(spy.call_count, 1)
+        self.assertIsNone(storage.get(City, self.city.id))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+#!/usr/bin/python3
+"""
+Contains the TestHTTPCache class
+"""
+
+from datetime import timezone
+import time
+import unittest
+from unittest import mock
+from api.v1.app import app
+from api.v1.views import http_cache
+from models import storage
+from models.engine import generations
+from models.state import State
+
+
+class TestHTTPCache(unittest.TestCase):
+    """Test the ETag and Last-Modified of the GET endpoints"""
+
+    def setUp(self):
+        """Store a state and empty the cached bodies"""
+        self.state = State(name="Souss-Massa")
+        storage.new(self.state)
+        storage.save()
+        storage.close()
+        self.client = app.test_client()
+        self.url = "/api/v1/states/" + self.state.id
+        http_cache.bodies.clear()
+
+    def tearDown(self):
+        """Delete the state"""
+        state = storage.get(State, self.state.id)
+        if state is not None:
+            storage.delete(state)
+            storage.save()
+        storage.close()
+
+    def later(self, seconds=2):
+        """Return a patch moving the clock of the cache ahead"""
+        now = time.time() + seconds
+        return mock.patch.object(http_cache.time, "time", return_value=now)
+
+    def test_etag(self):
+        """Test that a client sending the ETag back is answered 304"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.cache_control.no_cache)
+        etag = response.headers["ETag"]
+        response = self.client.get(self.url,
+                                   headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers["ETag"], etag)
+        self.assertEqual(response.get_data(), b"")
+        # the ETag of a compressed body
+        response = self.client.get(
+            self.url, headers={"If-None-Match": etag[:-1] + '-gzip"'})
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(self.url,
+                                   headers={"If-None-Match": '"other"'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_etag_changes(self):
+        """Test that a change answers the old ETag with the new body"""
+        etag = self.client.get(self.url).headers["ETag"]
+        response = self.client.put(self.url, json={"name": "Draa-Tafilalet"})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(self.url,
+                                   headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+        self.assertEqual(response.get_json()["name"], "Draa-Tafilalet")
+
+    def test_cached_body(self):
+        """Test that the body of a current ETag is sent from the cache"""
+        first = self.client.get(self.url)
+        self.assertIsNotNone(http_cache.bodies.get("/api/v1/states/{}?"
+                                                   .format(self.state.id)))
+        with mock.patch.object(storage, "get") as get:
+            second = self.client.get(self.url)
+        get.assert_not_called()
+        self.assertEqual(second.get_data(), first.get_data())
+        self.assertEqual(second.headers["ETag"], first.headers["ETag"])
+        self.assertEqual(second.content_type, first.content_type)
+
+    def test_last_modified(self):
+        """Test that a client sending the date back is answered 304"""
+        # the start of a TTL period counts as a change, which could fall
+        # in the current second
+        with self.later(), mock.patch.object(http_cache, "ttl", 0):
+            response = self.client.get(self.url)
+            self.assertEqual(response.status_code, 200)
+            date = response.headers["Last-Modified"]
+            response = self.client.get(
+                self.url, headers={"If-Modified-Since": date})
+            self.assertEqual(response.status_code, 304)
+            response = self.client.get(
+                self.url,
+                headers={"If-Modified-Since": "Thu, 01 Jan 1970 00:00:00 GMT"})
+            self.assertEqual(response.status_code, 200)
+
+    def test_last_modified_same_second(self):
+        """Test that no date is given nor trusted during the second of a
+        change, which a later change in that second could not be told
+        from"""
+        response = self.client.put(self.url, json={"name": "Oriental"})
+        self.assertEqual(response.status_code, 200)
+        changed = generations.generation(("State",))[1]
+        now = changed.replace(tzinfo=timezone.utc).timestamp()
+        with mock.patch.object(http_cache.time, "time", return_value=now):
+            response = self.client.get(self.url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("Last-Modified", response.headers)
+            response = self.client.get(
+                self.url,
+                headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"})
+            self.assertEqual(response.status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
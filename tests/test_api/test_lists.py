@@ -0,0 +1,99 @@
+#!/usr/bin/python3
+"""
+Contains the TestLists class
+"""
+
+import json
+import unittest
+from api.v1.app import app
+from api.v1.views import http_cache
+from models import storage
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+
+
+class TestLists(unittest.TestCase):
+    """Test that the list endpoints stream valid JSON arrays"""
+
+    def setUp(self):
+        """Store a state with a place and its review, and a state with no
+        city"""
+        self.state = State(name="Guelmim-Oued Noun")
+        self.empty = State(name="Laayoune-Sakia El Hamra")
+        self.city = City(name="Guelmim", state_id=self.state.id)
+        self.user = User(email="lists@hbnb.io", password="pwd")
+        self.place = Place(name="Oasis", city_id=self.city.id,
+                           user_id=self.user.id)
+        self.review = Review(text="Quiet", place_id=self.place.id,
+                             user_id=self.user.id)
+        self.amenity = Amenity(name="Palm trees")
+        self.objects = [self.state, self.empty, self.city, self.user,
+                        self.place, self.review, self.amenity]
+        for obj in self.objects:
+            storage.new(obj)
+        storage.save()
+        storage.close()
+        self.client = app.test_client()
+        http_cache.bodies.clear()
+
+    def tearDown(self):
+        """Delete the objects, children first"""
+        for obj in reversed(self.objects):
+            obj = storage.get(type(obj), obj.id)
+            if obj is not None:
+                storage.delete(obj)
+                storage.save()
+        storage.close()
+
+    def array(self, url, body=None):
+        """Return the array of the streamed response to a GET of url, or
+        to a POST of body if it is given"""
+        if body is None:
+            response = self.client.get(url)
+        else:
+            response = self.client.post(url, json=body)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(response.mimetype, "application/json")
+        array = json.loads(response.get_data())
+        self.assertIsInstance(array, list)
+        return array
+
+    def test_lists(self):
+        """Test that each list holds the object stored under it"""
+        lists = (("/api/v1/states", None, self.state),
+                 ("/api/v1/users", None, self.user),
+                 ("/api/v1/amenities", None, self.amenity),
+                 ("/api/v1/states/{}/cities".format(self.state.id), None,
+                  self.city),
+                 ("/api/v1/cities/{}/places".format(self.city.id), None,
+                  self.place),
+                 ("/api/v1/places/{}/reviews".format(self.place.id), None,
+                  self.review),
+                 ("/api/v1/places_search", {}, self.place),
+                 ("/api/v1/places_search", {"states": [self.state.id]},
+                  self.place))
+        for url, body, obj in lists:
+            with self.subTest(url=url, body=body):
+                ids = [item["id"] for item in self.array(url, body)]
+                self.assertIn(obj.id, ids)
+                if url.endswith("/cities") or "states" in (body or {}):
+                    self.assertEqual(ids, [obj.id])
+
+    def test_empty(self):
+        """Test that an empty list is sent as an empty array"""
+        self.assertEqual(self.array(
+            "/api/v1/states/{}/cities".format(self.empty.id)), [])
+        self.assertEqual(self.array("/api/v1/places_search",
+                                    {"states": [self.empty.id]}), [])
+        response = self.client.get(
+            "/api/v1/states/{}/cities".format(self.empty.id))
+        self.assertEqual(response.get_data(), b"[]\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+#!/usr/bin/python3
+"""
+Contains the TestPaging class
+"""
+
+from base64 import urlsafe_b64encode
+from datetime import datetime
+import json
+import unittest
+from werkzeug.exceptions import BadRequest
+from api.v1.views import paging
+
+
+def cursor(*position):
+    """Return the cursor of a position given as JSON values"""
+    data = json.dumps(position).encode("utf-8")
+    return urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+class TestPaging(unittest.TestCase):
+    """Test the cursors of the list endpoints"""
+
+    def test_decode_cursor(self):
+        """Test that a cursor gives back its position"""
+        created_at = datetime(2017, 9, 28, 21, 3, 54, 52298)
+        self.assertEqual(paging.decode_cursor(
+            cursor(created_at.isoformat(), "1")), (created_at, "1"))
+
+    def test_invalid_cursor(self):
+        """Test that an invalid cursor is a bad request"""
+        for bad in ("!", cursor("not a date", "1"),
+                    cursor("2017-09-28T21:03:54", 1),
+                    cursor("2017-09-28T21:03:54+00:00", "1")):
+            with self.subTest(cursor=bad):
+                with self.assertRaises(BadRequest):
+                    paging.decode_cursor(bad)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+#!/usr/bin/python3
+"""
+Contains the TestRules class
+"""
+
+import unittest
+from api.v1.app import app
+from api.v1.views.rules import update_object
+from models import storage
+from models.user import User
+
+
+class TestRules(unittest.TestCase):
+    """Test that the views of a class and the bulk view check the same
+    rules"""
+
+    def setUp(self):
+        """Store a user"""
+        self.user = User(email="a@hbnb.io", password="pwd")
+        storage.new(self.user)
+        storage.save()
+        storage.close()
+        self.client = app.test_client()
+
+    def tearDown(self):
+        """Delete the user"""
+        user = storage.get(User, self.user.id)
+        if user is not None:
+            storage.delete(user)
+            storage.save()
+        storage.close()
+
+    def test_required(self):
+        """Test that a create lacking a required key is rejected"""
+        response = self.client.post("/api/v1/users",
+                                    json={"email": "b@hbnb.io"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(b"Missing password", response.get_data())
+        response = self.client.post("/api/v1/bulk", json=[
+            {"op": "create", "class": "User", "data": {"email": "b@hbnb.io"}}])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(b"Operation 0: Missing password", response.get_data())
+
+    def test_ignored(self):
+        """Test that an update leaves the ignored keys alone"""
+        ops = [{"op": "update", "class": "User", "id": self.user.id,
+                "data": {"email": "c@hbnb.io", "first_name": "Bulk"}}]
+        requests = (("View", self.client.put, "/api/v1/users/" + self.user.id,
+                     {"email": "c@hbnb.io", "first_name": "View"}),
+                    ("Bulk", self.client.post, "/api/v1/bulk", ops))
+        for name, method, url, body in requests:
+            with self.subTest(url=url):
+                self.assertEqual(method(url, json=body).status_code, 200)
+                storage.close()
+                user = storage.get(User, self.user.id)
+                self.assertEqual(user.email, "a@hbnb.io")
+                self.assertEqual(user.first_name, name)
+
+    def test_update_object(self):
+        """Test that update_object ignores the keys of the class"""
+        user = User(email="d@hbnb.io")
+        update_object(user, {"id": "other", "email": "e@hbnb.io",
+                             "last_name": "Rules"})
+        self.assertNotEqual(user.id, "other")
+        self.assertEqual(user.email, "d@hbnb.io")
+        self.assertEqual(user.last_name, "Rules")
+
+
+if __name__ == "__main__":
+    unittest.main()
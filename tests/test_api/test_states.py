@@ -0,0 +1,38 @@
+#!/usr/bin/python3
+"""
+Contains the TestStates class
+"""
+
+import unittest
+from api.v1.app import app
+from models import storage
+from models.state import State
+
+
+class TestStates(unittest.TestCase):
+    """Test the State views"""
+
+    def setUp(self):
+        """Create the test client"""
+        self.client = app.test_client()
+
+    def tearDown(self):
+        """Close the storage"""
+        storage.close()
+
+    def test_create_aware_timestamp(self):
+        """Test that a timestamp with a time zone is not stored, which
+        would break the ordering of the list"""
+        count = storage.count(State)
+        response = self.client.post("/api/v1/states", json={
+            "name": "Beni Mellal", "created_at": "2020-01-01T00:00:00+00:00"})
+        self.assertNotEqual(response.status_code, 201)
+        storage.close()
+        self.assertEqual(storage.count(State), count)
+        for url in ("/api/v1/states", "/api/v1/states?limit=1"):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,202 @@
+#!/usr/bin/python3
+"""
+Contains the TestHTTPCompressionDocs and TestHTTPCompression classes
+"""
+
+import gzip
+import http_compression
+import inspect
+import json
+import pep8
+import unittest
+from unittest import mock
+import zlib
+from flask import Flask, Response, request
+
+
+class TestHTTPCompressionDocs(unittest.TestCase):
+    """Tests to check the documentation and style of http_compression"""
+    def test_pep8_conformance_http_compression(self):
+        """Test that http_compression.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['http_compression.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_http_compression(self):
+        """Test that tests/test_http_compression.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_http_compression.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_http_compression_module_docstring(self):
+        """Test for the http_compression.py module docstring"""
+        self.assertIsNot(http_compression.__doc__, None,
+                         "http_compression.py needs a docstring")
+        self.assertTrue(len(http_compression.__doc__) >= 1,
+                        "http_compression.py needs a docstring")
+
+    def test_http_compression_func_docstrings(self):
+        """Test for the presence of docstrings in http_compression"""
+        for func in inspect.getmembers(http_compression, inspect.isfunction):
+            if func[1].__module__ != http_compression.__name__:
+                continue
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+def decode(data, encoding):
+    """Return data decompressed from encoding"""
+    if encoding == "gzip":
+        return gzip.decompress(data)
+    if encoding == "deflate":
+        return zlib.decompress(data)
+    return http_compression.zstandard.ZstdDecompressor().decompressobj() \
+        .decompress(data)
+
+
+class TestHTTPCompression(unittest.TestCase):
+    """Test the compression of the responses of a flask app"""
+
+    def setUp(self):
+        """Create an app whose responses are compressed"""
+        self.objects = [{"id": str(i), "name": "Place {}".format(i)}
+                        for i in range(500)]
+        self.body = json.dumps(self.objects).encode("utf-8")
+        app = Flask(__name__)
+        http_compression.init_app(app)
+
+        @app.route("/json")
+        def whole():
+            """Return the objects as one body"""
+            return Response(self.body, mimetype="application/json")
+
+        @app.route("/short")
+        def short():
+            """Return a body too short to be compressed"""
+            return Response(b'{"a": 1}', mimetype="application/json")
+
+        @app.route("/stream")
+        def stream():
+            """Return the objects as a streamed array"""
+            def generate():
+                """Yield the array piece by piece"""
+                separator = "["
+                for obj in self.objects:
+                    yield separator + json.dumps(obj)
+                    separator = ", "
+                yield "]"
+            return Response(generate(), mimetype="application/json")
+
+        @app.route("/etag")
+        def etag():
+            """Return the objects with an ETag, 304 if the client holds
+            them"""
+            if request.if_none_match:
+                response = Response(status=304)
+            else:
+                response = Response(self.body, mimetype="application/json")
+            response.set_etag("abc")
+            return response
+
+        self.client = app.test_client()
+        http_compression.bodies.clear()
+
+    def get(self, path, encoding, **headers):
+        """Return the response to a GET accepting encoding"""
+        if encoding is not None:
+            headers["Accept-Encoding"] = encoding
+        return self.client.get(path, headers=headers)
+
+    def test_negotiation(self):
+        """Test that the best encoding the client accepts is used"""
+        offered = ["gzip", "deflate"]
+        if http_compression.zstandard is not None:
+            offered.insert(0, "zstd")
+        for encoding in offered:
+            with self.subTest(encoding=encoding):
+                response = self.get("/json", encoding)
+                self.assertEqual(response.headers["Content-Encoding"],
+                                 encoding)
+                self.assertIn("Accept-Encoding", response.headers["Vary"])
+                self.assertEqual(decode(response.get_data(), encoding),
+                                 self.body)
+        response = self.get("/json", "deflate;q=0.5, gzip")
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        response = self.get("/json", "zstd, gzip")
+        self.assertEqual(response.headers["Content-Encoding"],
+                         offered[0])
+
+    def test_no_encoding(self):
+        """Test that a client accepting no encoding gets the body as is"""
+        for encoding in (None, "identity", "br"):
+            with self.subTest(encoding=encoding):
+                response = self.get("/json", encoding)
+                self.assertNotIn("Content-Encoding", response.headers)
+                self.assertEqual(response.get_data(), self.body)
+
+    def test_min_size(self):
+        """Test that a body under min_size is sent as is"""
+        response = self.get("/short", "gzip")
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertEqual(response.get_data(), b'{"a": 1}')
+        with mock.patch.object(http_compression, "min_size", 4):
+            response = self.get("/short", "gzip")
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.get_data()), b'{"a": 1}')
+
+    def test_stream(self):
+        """Test that a streamed body is compressed as it is sent"""
+        response = self.get("/stream", "gzip")
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertNotIn("Content-Length", response.headers)
+        self.assertEqual(json.loads(gzip.decompress(response.get_data())),
+                         self.objects)
+
+    def test_compress_chunks(self):
+        """Test that the chunks decode one by one to the whole body"""
+        chunks = [self.body[i:i + 1000]
+                  for i in range(0, len(self.body), 1000)]
+        stream = zlib.decompressobj(31)
+        data = b"".join(stream.decompress(chunk) for chunk in
+                        http_compression.compress_chunks(chunks, "gzip"))
+        self.assertEqual(json.loads(data + stream.flush()), self.objects)
+
+    def test_not_modified(self):
+        """Test that a client holding the compressed body gets its ETag"""
+        response = self.get("/etag", "gzip")
+        self.assertEqual(response.headers["ETag"], '"abc-gzip"')
+        response = self.get("/etag", "gzip", **{"If-None-Match":
+                                                '"abc-gzip"'})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers["ETag"], '"abc-gzip"')
+        # the client holds the body not compressed
+        response = self.get("/etag", "gzip", **{"If-None-Match": '"abc"'})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers["ETag"], '"abc"')
+
+    def test_cache(self):
+        """Test that a body with an ETag is only compressed once"""
+        compress = http_compression.compress
+        with mock.patch.object(http_compression, "compress",
+                               side_effect=compress) as spy:
+            first = self.get("/etag", "gzip")
+            second = self.get("/etag", "gzip")
+            self.assertEqual(spy.call_count, 1)
+            self.assertEqual(second.get_data(), first.get_data())
+            self.get("/etag", "deflate")
+            self.assertEqual(spy.call_count, 2)
+            # no ETag, no cache
+            self.get("/json", "gzip")
+            self.get("/json", "gzip")
+            self.assertEqual(spy.call_count, 4)
+        self.assertEqual(http_compression.bodies.get('abc-gzip'),
+                         first.get_data())
+
+
+if __name__ == "__main__":
+    unittest.main()
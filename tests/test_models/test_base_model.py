@@ -2,6 +2,7 @@
 """Test BaseModel for expected behavior and documentation"""
 from datetime import datetime
 import inspect
+import json
 import models
 import pep8 as pycodestyle
 import time
@@ -138,6 +139,23 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(new_d["created_at"], bm.created_at.strftime(t_format))
         self.assertEqual(new_d["updated_at"], bm.updated_at.strftime(t_format))
 
+    def test_to_dict_password(self):
+        """test that to_dict only keeps the password when asked to"""
+        inst = BaseModel()
+        inst.password = "secret"
+        self.assertNotIn("password", inst.to_dict())
+        self.assertEqual(inst.to_dict(save_to_dict=True)["password"],
+                         "secret")
+        self.assertEqual(inst.password, "secret")
+
+    def test_to_json(self):
+        """test that to_json is to_dict encoded as UTF-8 JSON bytes"""
+        inst = BaseModel()
+        inst.name = "Fès"
+        data = inst.to_json()
+        self.assertIsInstance(data, bytes)
+        self.assertEqual(json.loads(data.decode("utf-8")), inst.to_dict())
+
     def test_str(self):
         """test that the str method has the correct output"""
         inst = BaseModel()
@@ -158,3 +176,36 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(old_created_at, new_created_at)
         self.assertTrue(mock_storage.new.called)
         self.assertTrue(mock_storage.save.called)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_from_storage_dict(self):
+        """Test that from_storage_dict rebuilds what to_dict wrote"""
+        inst = BaseModel()
+        inst.name = "Holberton"
+        inst.tags = ["a", "b"]
+        d = inst.to_dict()
+        new = BaseModel.from_storage_dict(d)
+        self.assertIs(type(new), BaseModel)
+        self.assertEqual(new.__dict__, inst.__dict__)
+        self.assertIsNot(new.tags, d["tags"])
+        self.assertNotIn(new, models.base_model.dirty)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_from_storage_dict_defaults(self):
+        """Test that missing id and timestamps are filled in"""
+        new = BaseModel.from_storage_dict({"__class__": "BaseModel"})
+        self.assertIs(type(new.id), str)
+        self.assertIs(type(new.created_at), datetime)
+        self.assertIs(type(new.updated_at), datetime)
+
+    def test_timestamp_formats(self):
+        """Test that only the timestamps of to_dict are accepted, naive"""
+        for value in ("2020-01-01T00:00:00+00:00", "2020-01-01",
+                      "2020-01-01T00:00:00"):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    BaseModel(created_at=value)
+        with self.assertRaises(ValueError):
+            BaseModel.from_storage_dict(
+                {"__class__": "BaseModel",
+                 "created_at": "2020-01-01T00:00:00.000000+00:00"})
@@ -0,0 +1,133 @@
+#!/usr/bin/python3
+"""
+Contains the TestBinarySnapshotDocs and TestBinarySnapshot classes
+"""
+
+import inspect
+import io
+import json
+import os
+import pep8
+import tempfile
+import unittest
+from models.engine import binary_snapshot
+from models.place import Place
+from models.state import State
+from models.user import User
+
+
+class TestBinarySnapshotDocs(unittest.TestCase):
+    """Tests to check the documentation and style of binary_snapshot"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.bs_f = inspect.getmembers(binary_snapshot, inspect.isfunction)
+
+    def test_pep8_conformance_binary_snapshot(self):
+        """Test that models/engine/binary_snapshot.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/binary_snapshot.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_binary_snapshot(self):
+        """Test that test_binary_snapshot.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_binary_snapshot.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_binary_snapshot_module_docstring(self):
+        """Test for the binary_snapshot.py module docstring"""
+        self.assertIsNot(binary_snapshot.__doc__, None,
+                         "binary_snapshot.py needs a docstring")
+        self.assertTrue(len(binary_snapshot.__doc__) >= 1,
+                        "binary_snapshot.py needs a docstring")
+
+    def test_bs_func_docstrings(self):
+        """Test for the presence of docstrings in binary_snapshot"""
+        for func in self.bs_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} function needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} function needs a docstring".format(func[0]))
+
+
+class TestBinarySnapshot(unittest.TestCase):
+    """Test the binary snapshot format"""
+    def setUp(self):
+        """Serialize a few objects the way FileStorage does"""
+        state = State(name="Casablanca-Settat")
+        place = Place(name="Dar", number_rooms=3, latitude=33.5,
+                      description=None, amenity_ids=["a", "b"])
+        place.big = 1 << 70
+        place.flag = True
+        user = User(email="a@b.c", first_name="Ali")
+        self.json_objects = {}
+        for obj in (state, place, user):
+            key = obj.__class__.__name__ + "." + obj.id
+            self.json_objects[key] = obj.to_dict()
+        self.json_objects["User." + user.id]["created_at"] = "not a date"
+
+    def dumps(self, json_objects):
+        """Return the binary snapshot of json_objects"""
+        f = io.BytesIO()
+        binary_snapshot.dump(json_objects, f)
+        return f.getvalue()
+
+    def test_round_trip(self):
+        """Test that load returns exactly what dump was given"""
+        data = self.dumps(self.json_objects)
+        self.assertTrue(data.startswith(binary_snapshot.MAGIC))
+        self.assertEqual(binary_snapshot.load(data), self.json_objects)
+
+    def test_layout(self):
+        """Test that the columns of one type are read with the struct"""
+        data = self.dumps(self.json_objects)
+        layouts = {name: layout for name, layout, id, offset, length
+                   in binary_snapshot.scan(data)}
+        place = layouts["Place"]
+        self.assertIsInstance(place, binary_snapshot.Layout)
+        self.assertIn("name", place.texts)
+        self.assertIn("amenity_ids", place.lists)
+        self.assertIn("number_rooms", place.fixed)
+        self.assertIn("latitude", place.fixed)
+        self.assertIn("flag", place.fixed)
+        # too big for the struct, or of no single type
+        self.assertIn("big", place.tagged)
+        self.assertIn("description", place.tagged)
+
+    def test_empty(self):
+        """Test that an empty snapshot loads as no objects"""
+        self.assertEqual(binary_snapshot.load(self.dumps({})), {})
+
+    def test_scan(self):
+        """Test that scan finds every record and decode reads it alone"""
+        data = self.dumps(self.json_objects)
+        seen = {}
+        for name, layout, id, offset, length in binary_snapshot.scan(data):
+            seen[name + "." + id] = binary_snapshot.decode(data, name,
+                                                           layout, offset)
+        self.assertEqual(seen, self.json_objects)
+
+    def test_not_a_snapshot(self):
+        """Test that loading anything else raises ValueError"""
+        with self.assertRaises(ValueError):
+            binary_snapshot.load(b'{"State.1": {}}')
+
+    def test_convert(self):
+        """Test the conversion from JSON to binary and back"""
+        with tempfile.TemporaryDirectory() as tmp:
+            src = os.path.join(tmp, "file.json")
+            dst = os.path.join(tmp, "file.bin")
+            back = os.path.join(tmp, "back.json")
+            with open(src, "w") as f:
+                json.dump(self.json_objects, f)
+            binary_snapshot.convert(src, dst)
+            binary_snapshot.convert(dst, back)
+            with open(dst, "rb") as f:
+                self.assertEqual(binary_snapshot.load(f.read()),
+                                 self.json_objects)
+            with open(back, "r") as f:
+                self.assertEqual(json.load(f), self.json_objects)
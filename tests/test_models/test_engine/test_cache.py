@@ -0,0 +1,108 @@
+#!/usr/bin/python3
+"""
+Contains the TestCacheDocs and TestLRUCache classes
+"""
+
+import inspect
+import pep8
+import unittest
+from unittest import mock
+from models.engine import cache
+LRUCache = cache.LRUCache
+
+
+class TestCacheDocs(unittest.TestCase):
+    """Tests to check the documentation and style of LRUCache class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.cache_f = inspect.getmembers(LRUCache, inspect.isfunction)
+
+    def test_pep8_conformance_cache(self):
+        """Test that models/engine/cache.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_cache(self):
+        """Test that test_cache.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_cache_module_docstring(self):
+        """Test for the cache.py module docstring"""
+        self.assertIsNot(cache.__doc__, None,
+                         "cache.py needs a docstring")
+        self.assertTrue(len(cache.__doc__) >= 1,
+                        "cache.py needs a docstring")
+
+    def test_lru_cache_class_docstring(self):
+        """Test for the LRUCache class docstring"""
+        self.assertIsNot(LRUCache.__doc__, None,
+                         "LRUCache class needs a docstring")
+        self.assertTrue(len(LRUCache.__doc__) >= 1,
+                        "LRUCache class needs a docstring")
+
+    def test_cache_func_docstrings(self):
+        """Test for the presence of docstrings in LRUCache methods"""
+        for func in self.cache_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestLRUCache(unittest.TestCase):
+    """Test the LRUCache class"""
+    def test_get_put(self):
+        """Test that hits and misses are counted"""
+        lru = LRUCache(2)
+        self.assertIsNone(lru.get("State.1"))
+        lru.put("State.1", "Souss")
+        self.assertEqual(lru.get("State.1"), "Souss")
+        self.assertEqual(lru.get("State.2", "none"), "none")
+        stats = lru.stats()
+        self.assertEqual((stats["size"], stats["hits"], stats["misses"]),
+                         (1, 1, 2))
+
+    def test_eviction(self):
+        """Test that the least recently used entry is evicted"""
+        lru = LRUCache(2)
+        lru.put("a", 1)
+        lru.put("b", 2)
+        lru.get("a")
+        lru.put("c", 3)
+        self.assertIsNone(lru.get("b"))
+        self.assertEqual(lru.get("a"), 1)
+        self.assertEqual(lru.get("c"), 3)
+        self.assertEqual(lru.stats()["evictions"], 1)
+
+    def test_ttl(self):
+        """Test that entries expire after ttl seconds"""
+        lru = LRUCache(2, ttl=10)
+        with mock.patch.object(cache.time, "monotonic", return_value=100):
+            lru.put("a", 1)
+        with mock.patch.object(cache.time, "monotonic", return_value=109):
+            self.assertEqual(lru.get("a"), 1)
+        with mock.patch.object(cache.time, "monotonic", return_value=110):
+            self.assertIsNone(lru.get("a"))
+        self.assertEqual(lru.stats()["expirations"], 1)
+        self.assertEqual(lru.stats()["size"], 0)
+
+    def test_pop_clear_disabled(self):
+        """Test that entries can be dropped and that size 0 caches nothing"""
+        lru = LRUCache(2)
+        lru.put("a", 1)
+        lru.put("b", 2)
+        lru.pop("a")
+        lru.pop("nope")
+        self.assertIsNone(lru.get("a"))
+        lru.clear()
+        self.assertIsNone(lru.get("b"))
+        disabled = LRUCache(0)
+        disabled.put("a", 1)
+        self.assertIsNone(disabled.get("a"))
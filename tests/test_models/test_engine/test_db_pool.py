@@ -0,0 +1,98 @@
+#!/usr/bin/python3
+"""
+Contains the TestDBPoolDocs and TestMeteredQueuePool classes
+"""
+
+import inspect
+import os
+import pep8
+import tempfile
+import unittest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError
+from models.engine import db_pool
+MeteredQueuePool = db_pool.MeteredQueuePool
+
+
+class TestDBPoolDocs(unittest.TestCase):
+    """Tests to check the documentation and style of db_pool"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.pool_f = inspect.getmembers(MeteredQueuePool, inspect.isfunction)
+
+    def test_pep8_conformance_db_pool(self):
+        """Test that models/engine/db_pool.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/db_pool.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_db_pool(self):
+        """Test that test_db_pool.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_db_pool.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_db_pool_module_docstring(self):
+        """Test for the db_pool.py module docstring"""
+        self.assertIsNot(db_pool.__doc__, None,
+                         "db_pool.py needs a docstring")
+        self.assertTrue(len(db_pool.__doc__) >= 1,
+                        "db_pool.py needs a docstring")
+
+    def test_metered_queue_pool_class_docstring(self):
+        """Test for the MeteredQueuePool class docstring"""
+        self.assertIsNot(MeteredQueuePool.__doc__, None,
+                         "MeteredQueuePool class needs a docstring")
+        self.assertTrue(len(MeteredQueuePool.__doc__) >= 1,
+                        "MeteredQueuePool class needs a docstring")
+
+    def test_pool_func_docstrings(self):
+        """Test for the presence of docstrings in MeteredQueuePool methods"""
+        for func in self.pool_f:
+            if func[0] not in MeteredQueuePool.__dict__:
+                continue
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestMeteredQueuePool(unittest.TestCase):
+    """Test the metrics of the pool, SQLite standing in for MySQL"""
+    def setUp(self):
+        """Create an engine of one connection without overflow"""
+        self.tmp = tempfile.TemporaryDirectory()
+        url = "sqlite:///" + os.path.join(self.tmp.name, "hbnb.db")
+        self.engine = create_engine(url, poolclass=MeteredQueuePool,
+                                    pool_size=1, max_overflow=0,
+                                    pool_timeout=0.05)
+
+    def tearDown(self):
+        """Dispose of the engine and remove the database"""
+        self.engine.dispose()
+        self.tmp.cleanup()
+
+    def test_metrics(self):
+        """Test that checkouts, waits and timeouts are counted"""
+        metrics = self.engine.pool.metrics()
+        self.assertEqual(metrics["size"], 1)
+        self.assertEqual(metrics["checked_out"], 0)
+        self.assertEqual(metrics["checkouts"], 0)
+        with self.engine.connect():
+            metrics = self.engine.pool.metrics()
+            self.assertEqual(metrics["checked_out"], 1)
+            self.assertEqual(metrics["checkouts"], 1)
+            with self.assertRaises(TimeoutError):
+                self.engine.connect()
+        metrics = self.engine.pool.metrics()
+        self.assertEqual(metrics["checked_out"], 0)
+        self.assertEqual(metrics["checked_in"], 1)
+        self.assertEqual(metrics["checkouts"], 2)
+        self.assertEqual(metrics["timeouts"], 1)
+        self.assertGreaterEqual(metrics["wait_max"], 0.05)
+        self.assertGreaterEqual(metrics["wait_total"], metrics["wait_max"])
+        self.assertEqual(metrics["wait_avg"], metrics["wait_total"] / 2)
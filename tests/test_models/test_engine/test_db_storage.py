@@ -113,4 +113,111 @@ class TestFileStorage(unittest.TestCase):
         all_states = len(models.storage.all(State))
         all_states_count = models.storage.count(State)
 
-        self.assertEqual(all_states, all_states_count)
\ No newline at end of file
+        self.assertEqual(all_states, all_states_count)
+
+
+@unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+class TestDBStorageQueries(unittest.TestCase):
+    """Test the queries of DBStorage, run with HBNB_MYSQL_URL set to a
+    SQLite file standing in for MySQL"""
+    def setUp(self):
+        """Add a state, its city, a place and its amenity"""
+        self.user = User(email="hbnb@mail.com", password="pwd")
+        self.state = State(name="Souss")
+        self.city = City(name="Agadir", state_id=self.state.id)
+        self.wifi = Amenity(name="Wifi")
+        self.place = Place(name="Riad", city_id=self.city.id,
+                           user_id=self.user.id)
+        self.place.amenities.append(self.wifi)
+        self.objs = [self.user, self.state, self.city, self.wifi,
+                     self.place]
+        for obj in self.objs:
+            models.storage.new(obj)
+        models.storage.save()
+
+    def tearDown(self):
+        """Remove what setUp added"""
+        for obj in reversed(self.objs):
+            models.storage.delete(obj)
+        models.storage.save()
+
+    def test_count(self):
+        """Test that count agrees with all"""
+        self.assertEqual(models.storage.count(), len(models.storage.all()))
+        self.assertEqual(models.storage.count(State),
+                         len(models.storage.all(State)))
+        self.assertEqual(models.storage.count("Nope"), 0)
+
+    def test_iter_all(self):
+        """Test that iter_all yields the objects of all"""
+        self.assertEqual(list(models.storage.iter_all(State)),
+                         list(models.storage.all(State).values()))
+
+    def test_page(self):
+        """Test that pages follow (created_at, id)"""
+        states = sorted(models.storage.all(State).values(),
+                        key=lambda s: (s.created_at, s.id))
+        self.assertEqual(list(models.storage.page(State)), states)
+        after = (states[0].created_at, states[0].id)
+        self.assertEqual(models.storage.page(State, 1, after), states[1:2])
+        self.assertEqual(list(models.storage.page(City, None, None,
+                                                  "state_id", self.state.id)),
+                         [self.city])
+
+    def test_search(self):
+        """Test that search filters by state, city and amenities"""
+        search = models.storage.search
+        self.assertIn(self.place, search(states=[self.state.id]))
+        self.assertIn(self.place, search(cities=[self.city.id],
+                                         amenities=[self.wifi.id]))
+        self.assertEqual(search(states=["nope"]), [])
+        self.assertEqual(search(amenities=[self.wifi.id, "nope"]), [])
+
+    def test_get_many(self):
+        """Test that get_many returns the objects found by id"""
+        models.storage.close()
+        found = models.storage.get_many(State, [self.state.id, "nope", 3])
+        self.assertEqual(list(found), [self.state.id])
+        self.assertEqual(found[self.state.id].name, "Souss")
+        self.assertEqual(models.storage.get_many("City", [self.city.id]),
+                         {self.city.id: models.storage.get(City,
+                                                           self.city.id)})
+        self.assertEqual(models.storage.get_many("Nope", [self.city.id]), {})
+
+    def test_pool_status(self):
+        """Test that the pool reports its checkouts"""
+        status = models.storage.pool_status()
+        self.assertGreater(status["checkouts"], 0)
+        self.assertIn("wait_avg", status)
+
+    def test_migrate(self):
+        """Test that migrate creates the indexes a table lacks"""
+        self.assertEqual(models.storage.migrate(), [])
+        index = next(i for i in City.__table__.indexes
+                     if i.name == "ix_cities_state_id")
+        models.storage.close()
+        index.drop(models.storage._DBStorage__engine)
+        self.assertEqual(models.storage.migrate(), ["ix_cities_state_id"])
+
+    def test_cache(self):
+        """Test that get reads the reference tables through the cache"""
+        models.storage.close()
+        before = models.storage.cache_stats()
+        self.assertEqual(models.storage.get(State, self.state.id).name,
+                         "Souss")
+        models.storage.close()
+        state = models.storage.get(State, self.state.id)
+        self.assertEqual(state.name, "Souss")
+        self.assertIs(models.storage.get(State, self.state.id), state)
+        after = models.storage.cache_stats()
+        self.assertEqual(after["hits"], before["hits"] + 1)
+        self.assertEqual(state.cities[0].id, self.city.id)
+        state.name = "Souss-Massa"
+        models.storage.save()
+        models.storage.close()
+        self.assertEqual(models.storage.get(State, self.state.id).name,
+                         "Souss-Massa")
+        self.assertIn("State." + self.state.id, models.storage.all(State))
+        self.assertIn("State." + self.state.id, models.storage.all(State))
+        self.assertGreater(models.storage.cache_stats()["hits"],
+                           after["hits"])
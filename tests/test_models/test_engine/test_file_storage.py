@@ -6,9 +6,10 @@ Contains the TestFileStorageDocs classes
 from datetime import datetime
 import inspect
 import models
-from models.engine import file_storage
+from models.engine import binary_snapshot, file_storage, generations, keyset
+from models.engine.search_index import SearchIndex
 from models.amenity import Amenity
-from models.base_model import BaseModel
+from models.base_model import BaseModel, dirty
 from models.city import City
 from models.place import Place
 from models.review import Review
@@ -17,12 +18,62 @@ from models.user import User
 import json
 import os
 import pep8
+import tempfile
+import threading
 import unittest
+from unittest import mock
 FileStorage = file_storage.FileStorage
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
 
 
+def isolated_storage(path, **options):
+    """Patch FileStorage to start empty and to persist to path"""
+    attrs = {"_FileStorage__file_path": path,
+             "_FileStorage__log_size": 0,
+             "_FileStorage__loaded": None,
+             "_FileStorage__objects": {},
+             "_FileStorage__partitions": {},
+             "_FileStorage__children": {},
+             "_FileStorage__parents": {},
+             "_FileStorage__stored": {},
+             "_FileStorage__lazy": {},
+             "_FileStorage__order": {},
+             "_FileStorage__ranks": {},
+             "_FileStorage__search": SearchIndex(),
+             "_FileStorage__deleted": set()}
+    for key, value in options.items():
+        attrs["_FileStorage__" + key] = value
+    return mock.patch.multiple(FileStorage, **attrs)
+
+
+class IsolatedStorageTestCase(unittest.TestCase):
+    """Base of the test classes running a FileStorage on a temporary file,
+    given by file_name and options"""
+    # string - name of the file in the temporary directory
+    file_name = "file.json"
+    # dictionary - FileStorage attributes set for the tests
+    options = {}
+
+    def setUp(self):
+        """Persist to a temporary file with the options of the class"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, self.file_name)
+        self.patch = isolated_storage(self.path, **self.options)
+        self.patch.start()
+        self.storage = FileStorage()
+        # the relationship getters go through models.storage
+        self.storage_patch = mock.patch.object(models, "storage",
+                                               self.storage)
+        self.storage_patch.start()
+
+    def tearDown(self):
+        """Restore FileStorage and remove the temporary files"""
+        self.storage_patch.stop()
+        self.patch.stop()
+        self.tmp.cleanup()
+
+
 class TestFileStorageDocs(unittest.TestCase):
     """Tests to check the documentation and style of FileStorage class"""
     @classmethod
@@ -78,6 +129,39 @@ class TestFileStorage(unittest.TestCase):
         self.assertEqual(type(new_dict), dict)
         self.assertIs(new_dict, storage._FileStorageObjects)
 
+    @unittest.skipIf(models.storage_t in ('db', 'sqlite'),
+                     "not testing file storage")
+    def test_all_by_class(self):
+        """Test that all(cls) is a read-only view of one class only"""
+        state = State(name='Tanger')
+        city = City(name='Tetouan')
+        models.storage.new(state)
+        models.storage.new(city)
+        for cls in (State, "State"):
+            with self.subTest(cls=cls):
+                states = models.storage.all(cls)
+                self.assertIn("State." + state.id, states)
+                self.assertNotIn("City." + city.id, states)
+                for value in states.values():
+                    self.assertIs(type(value), State)
+                with self.assertRaises(TypeError):
+                    states["State.x"] = state
+        models.storage.delete(state)
+        self.assertNotIn("State." + state.id, models.storage.all(State))
+        self.assertEqual(len(models.storage.all("Nope")), 0)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_iter_all(self):
+        """Test that iter_all yields the objects of all() one at a time"""
+        state = State(name='Oujda')
+        models.storage.new(state)
+        objs = models.storage.iter_all(State)
+        self.assertNotIsInstance(objs, (list, dict))
+        self.assertIn(state, list(objs))
+        self.assertEqual(list(models.storage.iter_all()),
+                         list(models.storage.all().values()))
+        self.assertEqual(list(models.storage.iter_all("Nope")), [])
+
     @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
     def test_new(self):
         """test that new adds an object to the FileStorage.__objects attr"""
@@ -125,6 +209,49 @@ class TestFileStorage(unittest.TestCase):
 
         self.assertEqual(state, state_object)
 
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_get_by_class_name(self):
+        """Test that get accepts the class name as well as the class"""
+        state = State(name='Rabat')
+        models.storage.new(state)
+        self.assertIs(models.storage.get("State", state.id), state)
+        self.assertIs(models.storage.get(State, state.id), state)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_get_missing(self):
+        """Test that get returns None for unknown ids and classes"""
+        state = State(name='Fes')
+        models.storage.new(state)
+        self.assertIsNone(models.storage.get(State, "nope"))
+        self.assertIsNone(models.storage.get(City, state.id))
+        self.assertIsNone(models.storage.get("Nope", state.id))
+        self.assertIsNone(models.storage.get(State, None))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_children(self):
+        """Test that the foreign key indexes back the relationship getters"""
+        state = State(name='Souss')
+        other = State(name='Draa')
+        city = City(name='Agadir', state_id=state.id)
+        place = Place(name='Riad', city_id=city.id)
+        review = Review(text='Nice', place_id=place.id)
+        amenity = Amenity(name='Wifi')
+        place.amenity_ids = [amenity.id]
+        for obj in (state, other, city, place, review, amenity):
+            models.storage.new(obj)
+        self.assertEqual(state.cities, [city])
+        self.assertEqual(city.places, [place])
+        self.assertEqual(place.reviews, [review])
+        self.assertEqual(place.amenities, [amenity])
+        self.assertEqual(models.storage.children(City, "state_id", state.id),
+                         [city])
+        city.state_id = other.id
+        models.storage.new(city)
+        self.assertEqual(state.cities, [])
+        self.assertEqual(other.cities, [city])
+        models.storage.delete(review)
+        self.assertEqual(place.reviews, [])
+
     @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
     def test_count(self):
         """Test that counts objects from file.json"""
@@ -136,4 +263,500 @@ class TestFileStorage(unittest.TestCase):
         all_state = len(models.storage.all(State))
         all_state_count = models.storage.count(State)
 
-        self.assertEqual(all_state, all_state_count)
\ No newline at end of file
+        self.assertEqual(all_state, all_state_count)
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageJournal(IsolatedStorageTestCase):
+    """Test the journaled save mode of the FileStorage class"""
+    options = {"journal": True, "journal_limit": 1048576}
+
+    def read_log(self):
+        """Return the records of the journal"""
+        with open(self.path + ".log", "r") as f:
+            return [json.loads(line) for line in f]
+
+    def test_save_appends_changes(self):
+        """Test that save only journals what changed since the last save"""
+        state = State(name="Oriental")
+        city = City(name="Oujda", state_id=state.id)
+        self.storage.new(state)
+        self.storage.new(city)
+        self.storage.save()
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(len(self.read_log()), 2)
+        state.name = "Oriental Region"
+        self.storage.delete(city)
+        self.storage.save()
+        records = self.read_log()[2:]
+        self.assertEqual(len(records), 2)
+        self.assertIn({"op": "set", "key": "State." + state.id,
+                       "value": state.to_dict()}, records)
+        self.assertIn({"op": "del", "key": "City." + city.id}, records)
+        self.storage.save()
+        self.assertEqual(len(self.read_log()), 4)
+
+    def test_reload_replays_journal(self):
+        """Test that reload applies the journal over the JSON file"""
+        state = State(name="Souss")
+        gone = State(name="Gone")
+        self.storage.new(state)
+        self.storage.new(gone)
+        self.storage.save()
+        state.name = "Souss-Massa"
+        self.storage.delete(gone)
+        self.storage.save()
+        with isolated_storage(self.path):
+            self.storage.reload()
+            self.assertEqual(list(self.storage.all()), ["State." + state.id])
+            self.assertEqual(self.storage.get(State, state.id).name,
+                             "Souss-Massa")
+
+    def test_compaction(self):
+        """Test that a journal past the limit is folded into the file"""
+        FileStorage._FileStorage__journal_limit = 1
+        state = State(name="Draa")
+        self.storage.new(state)
+        self.storage.save()
+        self.assertFalse(os.path.exists(self.path + ".log"))
+        with open(self.path, "r") as f:
+            self.assertEqual(json.load(f),
+                             {"State." + state.id: state.to_dict()})
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageDirty(IsolatedStorageTestCase):
+    """Test that save only serializes the objects that changed"""
+    options = {"journal": False}
+
+    def setUp(self):
+        """Persist two states to a temporary file"""
+        super().setUp()
+        self.changed = State(name="Guelmim")
+        self.clean = State(name="Laayoune")
+        self.storage.new(self.changed)
+        self.storage.new(self.clean)
+        self.storage.save()
+
+    def check_save(self):
+        """Change one state, save and check only it was serialized"""
+        self.assertNotIn(self.changed, dirty)
+        self.changed.name = "Guelmim-Oued Noun"
+        self.assertIn(self.changed, dirty)
+        self.assertNotIn(self.clean, dirty)
+        with mock.patch.object(State, "to_dict", autospec=True,
+                               side_effect=State.to_dict) as to_dict:
+            self.storage.save()
+        self.assertEqual(to_dict.call_count, 1)
+        self.assertIs(to_dict.call_args[0][0], self.changed)
+        self.assertNotIn(self.changed, dirty)
+        with isolated_storage(self.path):
+            self.storage.reload()
+            self.assertEqual(self.storage.get(State, self.changed.id).name,
+                             "Guelmim-Oued Noun")
+            self.assertEqual(self.storage.get(State, self.clean.id).name,
+                             "Laayoune")
+
+    def test_save_file(self):
+        """Test that rewriting the file reuses the clean objects"""
+        self.check_save()
+
+    def test_save_journal(self):
+        """Test that the journal only receives the changed object"""
+        FileStorage._FileStorage__journal = True
+        self.check_save()
+        with open(self.path + ".log", "r") as f:
+            self.assertEqual(len(f.readlines()), 1)
+
+    def check_failed_save(self):
+        """Fail to save a change, then check the next save writes it"""
+        self.changed.name = "Guelmim-Oued Noun"
+        with mock.patch.object(file_storage, "fsync",
+                               side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.storage.save()
+        self.assertIn(self.changed, dirty)
+        self.storage.new(State(name="Smara"))
+        self.storage.save()
+        self.assertNotIn(self.changed, dirty)
+        with isolated_storage(self.path):
+            self.storage.reload()
+            self.assertEqual(self.storage.get(State, self.changed.id).name,
+                             "Guelmim-Oued Noun")
+
+    def test_failed_save_file(self):
+        """Test that a change is kept when rewriting the file fails"""
+        self.check_failed_save()
+
+    def test_failed_save_journal(self):
+        """Test that a change is kept when appending to the journal
+        fails"""
+        FileStorage._FileStorage__journal = True
+        self.check_failed_save()
+
+    def test_generations(self):
+        """Test that new, save and delete count a change to the class"""
+        def count():
+            """Return the generation of State"""
+            return generations.generation(["State"])[0][0]
+        before = count()
+        self.storage.save()
+        self.assertEqual(count(), before)
+        self.changed.name = "Guelmim-Oued Noun"
+        self.storage.save()
+        self.assertEqual(count(), before + 1)
+        self.storage.new(State(name="Smara"))
+        self.assertEqual(count(), before + 2)
+        self.storage.delete(self.clean)
+        self.assertEqual(count(), before + 3)
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageClose(IsolatedStorageTestCase):
+    """Test that close only reloads what changed on disk"""
+    options = {"journal": False}
+
+    def setUp(self):
+        """Persist a state to a temporary file"""
+        super().setUp()
+        self.state = State(name="Fes-Meknes")
+        self.storage.new(self.state)
+        self.storage.save()
+
+    def test_close_unchanged(self):
+        """Test that close keeps the objects when nothing was written"""
+        self.storage.close()
+        self.assertIs(self.storage.get(State, self.state.id), self.state)
+
+    def test_close_rewritten_file(self):
+        """Test that close picks up a file rewritten by another process"""
+        city = City(name="Ifrane", state_id=self.state.id)
+        other = State(name="Other")
+        with open(self.path, "r") as f:
+            jo = json.load(f)
+        jo["City." + city.id] = city.to_dict()
+        self.storage.new(other)
+        self.storage.save()
+        with open(self.path, "w") as f:
+            json.dump(jo, f)
+        self.storage.close()
+        self.assertIs(self.storage.get(State, self.state.id), self.state)
+        self.assertEqual(self.storage.get(City, city.id).name, "Ifrane")
+        self.assertEqual(self.state.cities[0].id, city.id)
+        self.assertIsNone(self.storage.get(State, other.id))
+
+    def test_close_journal_delta(self):
+        """Test that close only reads what was appended to the journal"""
+        FileStorage._FileStorage__journal = True
+        city = City(name="Sefrou", state_id=self.state.id)
+        records = [{"op": "set", "key": "City." + city.id,
+                    "value": city.to_dict()}]
+        with open(self.path + ".log", "a") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+        self.storage.close()
+        self.assertIs(self.storage.get(State, self.state.id), self.state)
+        self.assertEqual(self.storage.get(City, city.id).name, "Sefrou")
+        with open(self.path + ".log", "a") as f:
+            f.write(json.dumps({"op": "del", "key": "City." + city.id}))
+            f.write("\n")
+        self.storage.close()
+        self.assertIsNone(self.storage.get(City, city.id))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageWriters(IsolatedStorageTestCase):
+    """Test that writers never lose or truncate each other's data"""
+    options = {"journal": False}
+
+    def test_atomic_write(self):
+        """Test that save replaces the file without leaving temp files"""
+        self.storage.new(State(name="Rabat-Sale"))
+        self.storage.save()
+        self.assertEqual(sorted(os.listdir(self.tmp.name)),
+                         ["file.json", "file.json.lock"])
+
+    def test_save_merges_other_writers(self):
+        """Test that save keeps what another process wrote meanwhile"""
+        state = State(name="Beni Mellal")
+        self.storage.new(state)
+        self.storage.save()
+        city = City(name="Khouribga", state_id=state.id)
+        with open(self.path, "r") as f:
+            jo = json.load(f)
+        jo["City." + city.id] = city.to_dict()
+        with open(self.path, "w") as f:
+            json.dump(jo, f)
+        state.name = "Beni Mellal-Khenifra"
+        self.storage.save()
+        with open(self.path, "r") as f:
+            jo = json.load(f)
+        self.assertEqual(jo["State." + state.id]["name"],
+                         "Beni Mellal-Khenifra")
+        self.assertIn("City." + city.id, jo)
+
+    def test_corrupt_file(self):
+        """Test that a corrupt file is reported, not read as empty"""
+        state = State(name="Marrakech-Safi")
+        self.storage.new(state)
+        self.storage.save()
+        with open(self.path, "w") as f:
+            f.write('{"State.')
+        with self.assertRaises(ValueError):
+            self.storage.close()
+        self.assertIs(self.storage.get(State, state.id), state)
+
+    def test_bad_record(self):
+        """Test that a record which cannot be built is reported, and the
+        changes around it are neither skipped nor overwritten"""
+        state = State(name="Tanger-Tetouan")
+        self.storage.new(state)
+        self.storage.save()
+        with open(self.path, "r") as f:
+            jo = json.load(f)
+        jo["Planet.1"] = {"__class__": "Planet", "id": "1"}
+        with open(self.path, "w") as f:
+            json.dump(jo, f)
+        state.name = "Tanger-Tetouan-Al Hoceima"
+        with self.assertRaises(KeyError):
+            self.storage.close()
+        with self.assertRaises(KeyError):
+            self.storage.save()
+        with open(self.path, "r") as f:
+            self.assertEqual(json.load(f), jo)
+
+    def test_threads(self):
+        """Test that concurrent saves from threads keep every object"""
+        states = [State(name="State {}".format(i)) for i in range(40)]
+
+        def work(chunk):
+            """Save a few states one by one"""
+            for state in chunk:
+                self.storage.new(state)
+                self.storage.save()
+                self.storage.close()
+        threads = [threading.Thread(target=work, args=(states[i::4],))
+                   for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        with open(self.path, "r") as f:
+            jo = json.load(f)
+        self.assertEqual(len(jo), 40)
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageBinary(IsolatedStorageTestCase):
+    """Test the FileStorage class with the binary snapshot format"""
+    file_name = "file.bin"
+    options = {"journal": False, "format": "binary", "lazy_load": False}
+
+    def test_save_reload(self):
+        """Test that objects read back from the binary file are equal"""
+        state = State(name="Tanger-Tetouan")
+        place = Place(name="Kasbah", number_rooms=4, amenity_ids=["x"])
+        self.storage.new(state)
+        self.storage.new(place)
+        self.storage.save()
+        with open(self.path, "rb") as f:
+            self.assertTrue(f.read().startswith(binary_snapshot.MAGIC))
+        with isolated_storage(self.path):
+            self.storage.reload()
+            for obj in (state, place):
+                loaded = self.storage.get(obj.__class__, obj.id)
+                self.assertIsNot(loaded, obj)
+                self.assertEqual(loaded.to_dict(), obj.to_dict())
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageLazy(IsolatedStorageTestCase):
+    """Test that a mapped binary file only builds the objects asked for"""
+    file_name = "file.bin"
+    options = {"journal": False, "format": "binary", "lazy_load": True}
+
+    def setUp(self):
+        """Write a binary file, then load it lazily"""
+        super().setUp()
+        self.states = [State(name="State {}".format(i)) for i in range(3)]
+        self.city = City(name="City", state_id=self.states[0].id)
+        with isolated_storage(self.path, journal=False, format="binary"):
+            for obj in self.states + [self.city]:
+                self.storage.new(obj)
+            self.storage.save()
+        self.storage.reload()
+
+    def built(self):
+        """Return the keys of the objects built so far"""
+        return set(FileStorage._FileStorage__objects)
+
+    def test_nothing_built(self):
+        """Test that reload and count build no object"""
+        self.assertEqual(self.built(), set())
+        self.assertEqual(self.storage.count(), 4)
+        self.assertEqual(self.storage.count(State), 3)
+        self.assertEqual(self.built(), set())
+
+    def test_get(self):
+        """Test that get only builds the object asked for"""
+        state = self.storage.get(State, self.states[1].id)
+        self.assertEqual(state.to_dict(), self.states[1].to_dict())
+        self.assertEqual(self.built(), {"State." + state.id})
+        self.assertIs(self.storage.get(State, state.id), state)
+        self.assertEqual(self.storage.count(State), 3)
+        self.assertIsNone(self.storage.get(State, "nope"))
+
+    def test_get_many(self):
+        """Test that get_many only builds the objects asked for"""
+        ids = [self.states[0].id, self.states[2].id, "nope", None]
+        found = self.storage.get_many(State, ids)
+        self.assertEqual(sorted(found), sorted(ids[:2]))
+        self.assertEqual(self.built(), {"State." + id for id in ids[:2]})
+        self.assertIs(found[ids[0]], self.storage.get(State, ids[0]))
+        self.assertEqual(self.storage.get_many("City", ids), {})
+        self.assertEqual(self.storage.get_many("Nope", ids), {})
+
+    def test_all(self):
+        """Test that all(cls) builds one class and all() every class"""
+        self.assertEqual(len(self.storage.all(State)), 3)
+        self.assertNotIn("City." + self.city.id, self.built())
+        state = self.storage.get(State, self.states[0].id)
+        self.assertEqual([c.id for c in state.cities], [self.city.id])
+        self.assertEqual(len(self.storage.all()), 4)
+
+    def test_save(self):
+        """Test that saving keeps the records that were never built"""
+        state = self.storage.get(State, self.states[2].id)
+        state.name = "Renamed"
+        self.storage.save()
+        self.assertEqual(self.built(), {"State." + state.id})
+        with isolated_storage(self.path, lazy_load=False):
+            self.storage.reload()
+            self.assertEqual(self.storage.count(), 4)
+            self.assertEqual(self.storage.get(State, state.id).name,
+                             "Renamed")
+        self.assertEqual(self.storage.get(State, self.states[0].id).name,
+                         "State 0")
+
+    def test_close_rewritten_file(self):
+        """Test that close maps a file rewritten by another process"""
+        built = self.storage.get(State, self.states[0].id)
+        with isolated_storage(self.path, lazy_load=False):
+            storage = FileStorage()
+            storage.reload()
+            storage.get(State, built.id).name = "Changed"
+            storage.delete(storage.get(State, self.states[1].id))
+            storage.save()
+        self.storage.close()
+        self.assertEqual(built.name, "State 0")
+        self.assertEqual(self.storage.get(State, built.id).name, "Changed")
+        self.assertIsNone(self.storage.get(State, self.states[1].id))
+        self.assertEqual(self.storage.count(), 3)
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStoragePage(IsolatedStorageTestCase):
+    """Test the keyset pages of FileStorage"""
+    def setUp(self):
+        """Start from five states created a second apart"""
+        super().setUp()
+        self.states = []
+        for i in range(5):
+            state = State(name="State {}".format(i))
+            state.created_at = datetime(2017, 9, 28, 21, 3, 54 - i)
+            self.states.insert(0, state)
+            self.storage.new(state)
+
+    def test_page(self):
+        """Test that pages follow (created_at, id) from the cursor on"""
+        self.assertEqual(self.storage.page(State), self.states)
+        self.assertEqual(self.storage.page(State, 2), self.states[:2])
+        after = keyset.sort_key(self.states[1])
+        self.assertEqual(self.storage.page(State, 2, after),
+                         self.states[2:4])
+        self.assertEqual(self.storage.page(State, 2, after, "name", None),
+                         [])
+        self.assertEqual(self.storage.page(City), [])
+        self.assertEqual(self.storage.page("Nope"), [])
+
+    def test_page_maintained(self):
+        """Test that the order follows new and deleted objects"""
+        self.storage.page(State)
+        state = State(name="First")
+        state.created_at = datetime(2000, 1, 1)
+        self.storage.new(state)
+        self.storage.delete(self.states[2])
+        self.assertEqual(self.storage.page(State, 3),
+                         [state] + self.states[:2])
+        self.states[0].created_at = datetime(2030, 1, 1)
+        self.storage.save()
+        self.assertEqual(self.storage.page(State)[-1], self.states[0])
+
+    def test_page_children(self):
+        """Test that pages of children only hold the objects of a parent"""
+        state = self.states[0]
+        cities = [City(name=str(i), state_id=state.id) for i in range(3)]
+        for city in cities:
+            self.storage.new(city)
+        self.storage.new(City(name="Elsewhere", state_id="other"))
+        page = self.storage.page(City, 2, None, "state_id", state.id)
+        self.assertEqual(page, keyset.page(cities, 2))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageSearch(IsolatedStorageTestCase):
+    """Test the places search of FileStorage"""
+    def setUp(self):
+        """Start from two states, three cities and their places"""
+        super().setUp()
+        self.wifi = Amenity(name="Wifi")
+        self.pool = Amenity(name="Pool")
+        self.souss = State(name="Souss")
+        self.draa = State(name="Draa")
+        self.agadir = City(name="Agadir", state_id=self.souss.id)
+        self.tiznit = City(name="Tiznit", state_id=self.souss.id)
+        self.zagora = City(name="Zagora", state_id=self.draa.id)
+        self.riad = Place(name="Riad", city_id=self.agadir.id,
+                          amenity_ids=[self.wifi.id, self.pool.id])
+        self.kasbah = Place(name="Kasbah", city_id=self.tiznit.id,
+                            amenity_ids=[self.wifi.id])
+        self.tent = Place(name="Tent", city_id=self.zagora.id)
+        for obj in (self.wifi, self.pool, self.souss, self.draa,
+                    self.agadir, self.tiznit, self.zagora, self.riad,
+                    self.kasbah, self.tent):
+            self.storage.new(obj)
+
+    def search(self, **criteria):
+        """Return the names of the places found"""
+        return sorted(p.name for p in self.storage.search(**criteria))
+
+    def test_search(self):
+        """Test the unions of states and cities and amenity intersections"""
+        self.assertEqual(self.search(), ["Kasbah", "Riad", "Tent"])
+        self.assertEqual(self.search(states=[self.souss.id]),
+                         ["Kasbah", "Riad"])
+        self.assertEqual(self.search(states=[self.souss.id],
+                                     cities=[self.zagora.id]),
+                         ["Kasbah", "Riad", "Tent"])
+        self.assertEqual(self.search(amenities=[self.wifi.id]),
+                         ["Kasbah", "Riad"])
+        self.assertEqual(self.search(amenities=[self.wifi.id,
+                                                self.pool.id]),
+                         ["Riad"])
+        self.assertEqual(self.search(cities=[self.zagora.id],
+                                     amenities=[self.wifi.id]), [])
+        self.assertEqual(self.search(states=["nope", ["bad"]]), [])
+        self.assertEqual(self.search(amenities=["nope"]), [])
+
+    def test_search_maintained(self):
+        """Test that the index follows new, changed and deleted objects"""
+        self.storage.delete(self.riad)
+        self.assertEqual(self.search(amenities=[self.pool.id]), [])
+        self.tent.amenity_ids = [self.pool.id]
+        self.storage.save()
+        self.assertEqual(self.search(amenities=[self.pool.id]), ["Tent"])
+        self.zagora.state_id = self.souss.id
+        self.storage.new(self.zagora)
+        self.assertEqual(self.search(states=[self.souss.id]),
+                         ["Kasbah", "Tent"])
+        self.assertEqual(self.search(states=[self.draa.id]), [])
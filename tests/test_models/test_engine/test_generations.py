@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+"""
+Contains the TestGenerationsDocs and TestGenerations classes
+"""
+
+from datetime import datetime
+import inspect
+import pep8
+import unittest
+from models.engine import generations
+
+
+class TestGenerationsDocs(unittest.TestCase):
+    """Tests to check the documentation and style of generations.py"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.generations_f = inspect.getmembers(generations,
+                                               inspect.isfunction)
+
+    def test_pep8_conformance_generations(self):
+        """Test that models/engine/generations.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/generations.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_generations(self):
+        """Test that test_generations.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_generations.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_generations_module_docstring(self):
+        """Test for the generations.py module docstring"""
+        self.assertIsNot(generations.__doc__, None,
+                         "generations.py needs a docstring")
+        self.assertTrue(len(generations.__doc__) >= 1,
+                        "generations.py needs a docstring")
+
+    def test_generations_func_docstrings(self):
+        """Test for the presence of docstrings in generations functions"""
+        for func in self.generations_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} function needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} function needs a docstring".format(func[0]))
+
+
+class TestGenerations(unittest.TestCase):
+    """Test the change counters of the classes"""
+    def test_unchanged(self):
+        """Test that a class never changed is at generation 0"""
+        counts, last = generations.generation(["Nope"])
+        self.assertEqual(counts, (0,))
+        self.assertEqual(last, generations.started)
+
+    def test_bump(self):
+        """Test that bump counts a change to one class only"""
+        before, _ = generations.generation(["Amenity", "Review"])
+        generations.bump("Review")
+        counts, last = generations.generation(["Amenity", "Review"])
+        self.assertEqual(counts, (before[0], before[1] + 1))
+        self.assertGreaterEqual(last, generations.started)
+        self.assertLessEqual(last, datetime.utcnow())
@@ -0,0 +1,205 @@
+#!/usr/bin/python3
+"""
+Contains the TestSQLiteStorageDocs and TestSQLiteStorage classes
+"""
+
+from datetime import datetime
+import inspect
+import models
+from models.engine import sqlite_storage
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+import os
+import pep8
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+SQLiteStorage = sqlite_storage.SQLiteStorage
+
+
+class TestSQLiteStorageDocs(unittest.TestCase):
+    """Tests to check the documentation and style of SQLiteStorage class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.sql_f = inspect.getmembers(SQLiteStorage, inspect.isfunction)
+
+    def test_pep8_conformance_sqlite_storage(self):
+        """Test that models/engine/sqlite_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/sqlite_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_sqlite_storage(self):
+        """Test that test_sqlite_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_sqlite_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_sqlite_storage_module_docstring(self):
+        """Test for the sqlite_storage.py module docstring"""
+        self.assertIsNot(sqlite_storage.__doc__, None,
+                         "sqlite_storage.py needs a docstring")
+        self.assertTrue(len(sqlite_storage.__doc__) >= 1,
+                        "sqlite_storage.py needs a docstring")
+
+    def test_sqlite_storage_class_docstring(self):
+        """Test for the SQLiteStorage class docstring"""
+        self.assertIsNot(SQLiteStorage.__doc__, None,
+                         "SQLiteStorage class needs a docstring")
+        self.assertTrue(len(SQLiteStorage.__doc__) >= 1,
+                        "SQLiteStorage class needs a docstring")
+
+    def test_sql_func_docstrings(self):
+        """Test for the presence of docstrings in SQLiteStorage methods"""
+        for func in self.sql_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing sqlite storage")
+class TestSQLiteStorage(unittest.TestCase):
+    """Test the SQLiteStorage class on a temporary database"""
+    def setUp(self):
+        """Create the database with a state, a city and a place"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "hbnb.db")
+        self.patch = mock.patch.object(SQLiteStorage,
+                                       "_SQLiteStorage__file_path",
+                                       self.path)
+        self.patch.start()
+        self.storage = SQLiteStorage()
+        self.storage.reload()
+        # the relationship getters go through models.storage
+        self.storage_patch = mock.patch.object(models, "storage",
+                                               self.storage)
+        self.storage_patch.start()
+        self.wifi = Amenity(name="Wifi")
+        self.user = User(email="hbnb@mail.com", password="pwd")
+        self.state = State(name="Souss")
+        self.city = City(name="Agadir", state_id=self.state.id)
+        self.place = Place(name="Riad", city_id=self.city.id,
+                           user_id=self.user.id, amenity_ids=[self.wifi.id])
+        for obj in (self.wifi, self.user, self.state, self.city, self.place):
+            self.storage.new(obj)
+        self.storage.save()
+
+    def tearDown(self):
+        """Restore models.storage and remove the database"""
+        self.storage.close()
+        self.storage_patch.stop()
+        self.patch.stop()
+        self.tmp.cleanup()
+
+    def other(self):
+        """Return another storage on the same database"""
+        storage = SQLiteStorage()
+        storage.reload()
+        return storage
+
+    def test_wal(self):
+        """Test that the database uses write-ahead logging"""
+        conn = sqlite3.connect(self.path)
+        mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        conn.close()
+        self.assertEqual(mode, "wal")
+
+    def test_get(self):
+        """Test that get returns the loaded object or reads its row"""
+        self.assertIs(self.storage.get(State, self.state.id), self.state)
+        self.assertIs(self.storage.get("State", self.state.id), self.state)
+        self.assertIsNone(self.storage.get(State, "nope"))
+        self.assertIsNone(self.storage.get("Nope", self.state.id))
+        state = self.other().get(State, self.state.id)
+        self.assertIsNot(state, self.state)
+        self.assertEqual(state.to_dict(), self.state.to_dict())
+        self.assertIsInstance(state.created_at, datetime)
+
+    def test_get_many(self):
+        """Test that get_many reads the rows not loaded in one query"""
+        self.assertEqual(self.storage.get_many(State, [self.state.id]),
+                         {self.state.id: self.state})
+        other = self.other()
+        found = other.get_many("City", [self.city.id, "nope", 3])
+        self.assertEqual(list(found), [self.city.id])
+        self.assertEqual(found[self.city.id].to_dict(), self.city.to_dict())
+        other.delete(found[self.city.id])
+        self.assertEqual(other.get_many(City, [self.city.id]), {})
+        self.assertEqual(other.get_many("Nope", [self.city.id]), {})
+
+    def test_all_and_count(self):
+        """Test that all and count see the objects of every class"""
+        self.assertEqual(self.storage.all(State),
+                         {"State." + self.state.id: self.state})
+        self.assertEqual(len(self.storage.all()), 5)
+        self.assertEqual(self.storage.count(), 5)
+        self.assertEqual(self.storage.count(City), 1)
+        self.assertEqual(self.storage.count("Nope"), 0)
+        self.assertEqual(list(self.storage.iter_all(Amenity)), [self.wifi])
+
+    def test_save_and_close(self):
+        """Test that only saved changes reach the database"""
+        self.state.name = "Souss-Massa"
+        self.storage.new(State(name="Draa"))
+        self.assertEqual(self.storage.count(State), 2)
+        other = self.other()
+        self.assertEqual(other.count(State), 1)
+        self.storage.close()
+        self.assertEqual(self.storage.count(State), 1)
+        self.assertEqual(self.storage.get(State, self.state.id).name,
+                         "Souss")
+        state = self.storage.get(State, self.state.id)
+        state.name = "Souss-Massa"
+        self.storage.save()
+        other.close()
+        self.assertEqual(other.get(State, self.state.id).name,
+                         "Souss-Massa")
+
+    def test_delete(self):
+        """Test that deleted objects are gone once saved"""
+        self.storage.delete(self.place)
+        self.assertIsNone(self.storage.get(Place, self.place.id))
+        self.assertEqual(self.storage.count(Place), 0)
+        self.storage.save()
+        self.assertIsNone(self.other().get(Place, self.place.id))
+        self.assertEqual(self.storage.search(amenities=[self.wifi.id]), [])
+
+    def test_relationships(self):
+        """Test that the getters query the indexed foreign keys"""
+        self.assertEqual(self.state.cities, [self.city])
+        self.assertEqual(self.city.places, [self.place])
+        self.assertEqual(self.place.amenities, [self.wifi])
+        self.assertEqual(self.storage.children(City, "name", "Agadir"), [])
+
+    def test_page(self):
+        """Test that pages follow (created_at, id)"""
+        states = [self.state]
+        for i in range(3):
+            state = State(name=str(i))
+            self.storage.new(state)
+            states.append(state)
+        states.sort(key=lambda s: (s.created_at, s.id))
+        self.assertEqual(self.storage.page(State), states)
+        after = (states[1].created_at, states[1].id)
+        self.assertEqual(self.storage.page(State, 1, after), states[2:3])
+        self.assertEqual(self.storage.page(City, None, None, "state_id",
+                                           self.state.id), [self.city])
+
+    def test_search(self):
+        """Test that search filters by state, city and amenities"""
+        search = self.storage.search
+        self.assertEqual(search(), [self.place])
+        self.assertEqual(search(states=[self.state.id]), [self.place])
+        self.assertEqual(search(cities=[self.city.id],
+                                amenities=[self.wifi.id]), [self.place])
+        self.assertEqual(search(states=["nope", ["bad"]]), [])
+        self.assertEqual(search(amenities=[self.wifi.id, "nope"]), [])
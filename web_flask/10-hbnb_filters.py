@@ -4,16 +4,18 @@ starts a Flask web application
 """
 
 from flask import Flask, render_template
+import http_compression
 from models import *
 from models import storage
 app = Flask(__name__)
+http_compression.init_app(app)
 
 
 @app.route('/hbnb_filters', strict_slashes=False)
 def filters():
     """display a HTML page like 6-index.html from static"""
-    states = storage.all("State").values()
-    amenities = storage.all("Amenity").values()
+    states = storage.iter_all("State")
+    amenities = storage.iter_all("Amenity")
     return render_template('10-hbnb_filters.html', states=states,
                            amenities=amenities)
 
@@ -4,7 +4,9 @@ starts a Flask web application
 """
 
 from flask import Flask, render_template
+import http_compression
 app = Flask(__name__)
+http_compression.init_app(app)
 
 
 @app.route('/', strict_slashes=False)
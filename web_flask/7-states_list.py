@@ -4,15 +4,17 @@ starts a Flask web application
 """
 
 from flask import Flask, render_template
+import http_compression
 from models import *
 from models import storage
 app = Flask(__name__)
+http_compression.init_app(app)
 
 
 @app.route('/states_list', strict_slashes=False)
 def states_list():
     """display a HTML page with the states listed in alphabetical order"""
-    states = sorted(list(storage.all("State").values()), key=lambda x: x.name)
+    states = sorted(storage.iter_all("State"), key=lambda x: x.name)
     return render_template('7-states_list.html', states=states)
 
 
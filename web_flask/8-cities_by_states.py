@@ -4,15 +4,17 @@ starts a Flask web application
 """
 
 from flask import Flask, render_template
+import http_compression
 from models import *
 from models import storage
 app = Flask(__name__)
+http_compression.init_app(app)
 
 
 @app.route('/cities_by_states', strict_slashes=False)
 def cities_by_states():
     """display the states and cities listed in alphabetical order"""
-    states = storage.all("State").values()
+    states = storage.iter_all("State")
     return render_template('8-cities_by_states.html', states=states)
 
 
@@ -4,9 +4,11 @@ starts a Flask web application
 """
 
 from flask import Flask, render_template
+import http_compression
 from models import *
 from models import storage
 app = Flask(__name__)
+http_compression.init_app(app)
 
 
 @app.route('/states', strict_slashes=False)